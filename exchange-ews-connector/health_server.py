@@ -5,49 +5,90 @@ Runs alongside the main sync process to provide health status
 
 import threading
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import json
 import os
 
+# Fast JSON serialization (optional but recommended)
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(data):
+        """Serialize data to compact JSON bytes."""
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+# Static parts of the /health response body
+_HEALTH_PREFIX = b'{"status":"healthy","service":"exchange-ews-connector","timestamp":"'
+_HEALTH_SUFFIX = b'"}'
+
+# /status fields that are fixed for the container's lifetime, including container info if available
+_STATIC_STATUS = {
+    "service": "exchange-ews-connector",
+    "version": "1.0.0",
+    "container_index": os.environ.get('CONTAINER_INDEX'),
+    "total_containers": os.environ.get('TOTAL_CONTAINERS'),
+    "sync_mode": os.environ.get('SYNC_MODE', 'delta'),
+}
+
+# (epoch second, formatted timestamp) of the last formatted response time
+_timestamp_cache = (0, '')
+
+def _iso_now():
+    """Return the current UTC time as an ISO 8601 string, formatted at most once per second."""
+    global _timestamp_cache
+    now = int(time.time())
+    cached_second, cached_timestamp = _timestamp_cache
+    if now != cached_second:
+        cached_timestamp = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(now))
+        _timestamp_cache = (now, cached_timestamp)
+    return cached_timestamp
+
 class HealthHandler(BaseHTTPRequestHandler):
     """HTTP handler for health check requests."""
     
+    # Close connections that stall for this many seconds so a misbehaving
+    # client cannot pin a server thread indefinitely
+    timeout = 5
+    
+    # Send small JSON responses immediately instead of waiting on Nagle's algorithm
+    disable_nagle_algorithm = True
+    
+    # Every response carries Content-Length, so probers can keep connections alive
+    protocol_version = 'HTTP/1.1'
+    
+    # Buffer writes so headers and body go out together when the request is flushed
+    wbufsize = -1
+    
+    # Path -> handler method name
+    _ROUTES = {
+        '/health': '_handle_health',
+        '/status': '_handle_status',
+    }
+    
     def do_GET(self):
         """Handle GET requests."""
-        if self.path == '/health':
-            self._handle_health()
-        elif self.path == '/status':
-            self._handle_status()
+        handler_name = self._ROUTES.get(self.path.split('?', 1)[0])
+        if handler_name:
+            getattr(self, handler_name)()
         else:
             self._handle_not_found()
     
     def _handle_health(self):
         """Handle health check endpoint."""
-        # Simple health check - if we can respond, we're healthy
-        response = {
-            "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "service": "exchange-ews-connector"
-        }
+        # Simple health check - if we can respond, we're healthy.
+        # Only the timestamp changes, so the body is assembled from precomputed bytes.
+        body = _HEALTH_PREFIX + _iso_now().encode('ascii') + _HEALTH_SUFFIX
         
-        self._send_json_response(200, response)
+        self._send_body(200, body)
     
     def _handle_status(self):
         """Handle status endpoint with more detailed information."""
-        # Get container info if available
-        container_index = os.environ.get('CONTAINER_INDEX')
-        total_containers = os.environ.get('TOTAL_CONTAINERS')
-        
         response = {
             "status": "running",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "service": "exchange-ews-connector",
-            "version": "1.0.0",
-            "container_index": container_index,
-            "total_containers": total_containers,
-            "sync_mode": os.environ.get('SYNC_MODE', 'delta'),
-            "uptime_seconds": int(time.time() - start_time)
+            "timestamp": _iso_now(),
+            **_STATIC_STATUS,
+            "uptime_seconds": (time.monotonic_ns() - _start_monotonic_ns) // 1_000_000_000
         }
         
         self._send_json_response(200, response)
@@ -63,13 +104,20 @@ class HealthHandler(BaseHTTPRequestHandler):
     
     def _send_json_response(self, status_code, data):
         """Send JSON response."""
+        self._send_body(status_code, _dumps(data))
+    
+    def _send_body(self, status_code, body):
+        """Send an already serialized JSON body with headers that allow connection reuse."""
         self.send_response(status_code)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
-        
-        json_data = json.dumps(data, indent=2)
-        self.wfile.write(json_data.encode('utf-8'))
+        self.wfile.write(body)
+    
+    def address_string(self):
+        """Return the client IP without any reverse DNS lookup."""
+        return self.client_address[0]
     
     def log_message(self, format, *args):
         """Override to reduce log noise."""
@@ -88,7 +136,9 @@ class HealthServer:
     def start(self):
         """Start the health server in a background thread."""
         try:
-            self.server = HTTPServer(('0.0.0.0', self.port), HealthHandler)
+            # Threaded server so a slow or stalled client never blocks other probes
+            self.server = ThreadingHTTPServer(('0.0.0.0', self.port), HealthHandler)
+            self.server.daemon_threads = True
             self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
             self.thread.start()
             print(f"🏥 Health server started on port {self.port}")
@@ -104,8 +154,8 @@ class HealthServer:
             self.server.server_close()
             print("🏥 Health server stopped")
 
-# Global start time for uptime calculation
-start_time = time.time()
+# Global start time for uptime calculation (monotonic, unaffected by clock adjustments)
+_start_monotonic_ns = time.monotonic_ns()
 
 # Global health server instance
 health_server = None
@@ -4,11 +4,13 @@ Handles configuration management, parameter store integration, and email validat
 """
 
 import os
-import re
+import time
+import string
 import boto3
 import logging
-from typing import List
-from botocore.exceptions import ClientError
+from functools import cached_property
+from typing import Dict, List
+from botocore.config import Config as BotoConfig
 from .security_utils import sanitize_for_logging, handle_error_securely, validate_aws_response
 
 # Email validation library (optional but recommended)
@@ -21,45 +23,136 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-def get_parameter_from_store(parameter_name: str, default_value: str = None) -> str:
-    """Get parameter from AWS Systems Manager Parameter Store"""
+# Character sets for fallback email validation when email-validator is not installed.
+# Whole-string set checks replace regex matching, so validation stays linear in length.
+_EMAIL_LOCAL_PART_CHARS = frozenset(string.ascii_letters + string.digits + ".!#$%&'*+/=?^_`{|}~-")
+_EMAIL_ADDRESS_CHARS = _EMAIL_LOCAL_PART_CHARS | {'@'}
+_DOMAIN_LABEL_CHARS = frozenset(string.ascii_letters + string.digits + '-')
+
+# GetParameters accepts at most 10 names per call
+SSM_GET_PARAMETERS_MAX_NAMES = 10
+
+# How long bulk-loaded parameter values are reused before Parameter Store is queried again
+PARAMETER_CACHE_TTL_SECONDS = 300
+
+# Shared boto3 session for all AWS clients, and SSM client for Parameter Store reads (created on first use)
+_boto3_session = None
+_ssm_client = None
+
+# Parameter path -> (value, expires_at)
+_parameter_cache = {}
+
+def get_boto3_session():
+    """Get the process-wide boto3 session, creating it on first use"""
+    global _boto3_session
+    if _boto3_session is None:
+        _boto3_session = boto3.session.Session()
+    return _boto3_session
+
+def _get_ssm_client():
+    """Get the shared SSM client, creating it on first use"""
+    global _ssm_client
+    if _ssm_client is None:
+        _ssm_client = get_boto3_session().client('ssm', config=BotoConfig(
+            max_pool_connections=10,
+            connect_timeout=2,
+            read_timeout=3,
+            retries={'max_attempts': 5, 'mode': 'adaptive'}
+        ))
+    return _ssm_client
+
+def _get_parameter_path(parameter_name: str) -> str:
+    """Build the full Parameter Store path for a parameter name"""
     environment = os.environ.get('ENVIRONMENT', 'dev')
     parameter_store_prefix = os.environ.get('PARAMETER_STORE_PREFIX', f'/exchange-connector/{environment}')
-    parameter_path = f"{parameter_store_prefix}/{parameter_name.lower().replace('_', '-')}"
-    
-    try:
-        ssm = boto3.client('ssm')
-        response = ssm.get_parameter(Name=parameter_path, WithDecryption=True)
-        
-        # Validate AWS response
-        if not validate_aws_response(response, ['Parameter']):
-            logger.error(f"Invalid response structure from Parameter Store for {parameter_name}")
-            return default_value
-        
-        return response['Parameter']['Value']
-    except ClientError as e:
-        error_code = e.response.get('Error', {}).get('Code', 'Unknown')
-        if error_code == 'ParameterNotFound':
-            logger.info(f"Parameter {sanitize_for_logging(parameter_name)} not found in Parameter Store")
-            # Fallback to environment variable for local development
-            env_value = os.environ.get(parameter_name, default_value)
-            if env_value:
-                logger.info(f"Using environment variable fallback for {sanitize_for_logging(parameter_name)}")
-                return env_value
-            return default_value
+    return f"{parameter_store_prefix}/{parameter_name.lower().replace('_', '-')}"
+
+def _get_env_fallback(parameter_name: str, default_value: str = None) -> str:
+    """Fallback to environment variable for local development"""
+    env_value = os.environ.get(parameter_name, default_value)
+    if env_value:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Using environment variable fallback for %s", sanitize_for_logging(parameter_name))
+        return env_value
+    return default_value
+
+def get_parameters_from_store(parameter_names: List[str], default_values: Dict[str, str] = None) -> Dict[str, str]:
+    """Get several parameters from Parameter Store using batched GetParameters calls.
+
+    Values are cached in-process for PARAMETER_CACHE_TTL_SECONDS. Parameters that are
+    missing from Parameter Store fall back to environment variables, then to defaults.
+    """
+    default_values = default_values or {}
+    paths = {name: _get_parameter_path(name) for name in parameter_names}
+    now = time.time()
+    
+    values = {}
+    missing_paths = []
+    for name, path in paths.items():
+        cached = _parameter_cache.get(path)
+        if cached and cached[1] > now:
+            values[name] = cached[0]
         else:
-            error_msg = handle_error_securely(e, f"retrieving parameter {parameter_name}")
+            missing_paths.append(path)
+    
+    if missing_paths:
+        try:
+            ssm = _get_ssm_client()
+            for i in range(0, len(missing_paths), SSM_GET_PARAMETERS_MAX_NAMES):
+                response = ssm.get_parameters(
+                    Names=missing_paths[i:i + SSM_GET_PARAMETERS_MAX_NAMES],
+                    WithDecryption=True
+                )
+                
+                # Validate AWS response
+                if not validate_aws_response(response, ['Parameters']):
+                    logger.error("Invalid response structure from Parameter Store for bulk parameter load")
+                    continue
+                
+                expires_at = now + PARAMETER_CACHE_TTL_SECONDS
+                for parameter in response['Parameters']:
+                    _parameter_cache[parameter['Name']] = (parameter['Value'], expires_at)
+        except Exception as e:
+            error_msg = handle_error_securely(e, "retrieving parameters in bulk")
             logger.error(error_msg)
-            return default_value
-    except Exception as e:
-        error_msg = handle_error_securely(e, f"retrieving parameter {parameter_name}")
-        logger.error(error_msg)
-        # Fallback to environment variable for local development
-        env_value = os.environ.get(parameter_name, default_value)
-        if env_value:
-            logger.info(f"Using environment variable fallback for {sanitize_for_logging(parameter_name)}")
-            return env_value
-        return default_value
+    
+    for name, path in paths.items():
+        if name in values:
+            continue
+        cached = _parameter_cache.get(path)
+        if cached and cached[1] > now:
+            values[name] = cached[0]
+        else:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Parameter %s not found in Parameter Store", sanitize_for_logging(name))
+            values[name] = _get_env_fallback(name, default_values.get(name))
+    
+    return values
+
+def get_parameter_from_store(parameter_name: str, default_value: str = None) -> str:
+    """Get parameter from AWS Systems Manager Parameter Store"""
+    # Same batched, cached path as the config loader, so there is one Parameter Store code path
+    return get_parameters_from_store([parameter_name], {parameter_name: default_value})[parameter_name]
+
+def _is_plausible_email(addr: str) -> bool:
+    """Cheap structural pre-check run before full email validation"""
+    return len(addr) <= 254 and addr.count('@') == 1  # RFC 5321 length limit
+
+def _is_valid_fallback_email(addr: str) -> bool:
+    """Validate an email address in linear time without email-validator"""
+    if not _is_plausible_email(addr) or not _EMAIL_ADDRESS_CHARS.issuperset(addr):
+        return False
+    
+    local_part, _, domain = addr.partition('@')
+    if not 1 <= len(local_part) <= 64:
+        return False
+    
+    for label in domain.split('.'):
+        if not (1 <= len(label) <= 63 and label[0] != '-' and label[-1] != '-'
+                and _DOMAIN_LABEL_CHARS.issuperset(label)):
+            return False
+    
+    return True
 
 def parse_email_addresses(addresses_raw: str) -> List[str]:
     """Parse and validate email addresses from configuration"""
@@ -67,11 +160,15 @@ def parse_email_addresses(addresses_raw: str) -> List[str]:
         return []
     
     # Split by comma and clean up whitespace
-    addresses = [addr.strip() for addr in addresses_raw.split(',') if addr.strip()]
+    addresses = list(filter(None, (addr.strip() for addr in addresses_raw.split(','))))
     valid_addresses = []
     
     for addr in addresses:
-        if EMAIL_VALIDATOR_AVAILABLE:
+        if not _is_plausible_email(addr):
+            # Reject obviously malformed entries before running a full validator
+            sanitized_addr = sanitize_for_logging(addr)
+            logger.warning(f"Invalid email address format: {sanitized_addr}")
+        elif EMAIL_VALIDATOR_AVAILABLE:
             # Use proper email validation library
             try:
                 validated = validate_email(addr)
@@ -80,12 +177,8 @@ def parse_email_addresses(addresses_raw: str) -> List[str]:
                 sanitized_addr = sanitize_for_logging(addr)
                 logger.warning(f"Invalid email address format: {sanitized_addr} - {e}")
         else:
-            # Fallback to improved regex validation
-            # More restrictive pattern that follows RFC 5322 more closely
-            email_pattern = re.compile(
-                r'^[a-zA-Z0-9.!#$%&\'*+/=?^_`{|}~-]+@[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$'
-            )
-            if email_pattern.match(addr) and len(addr) <= 254:  # RFC 5321 length limit
+            # Fallback to character-set validation
+            if _is_valid_fallback_email(addr):
                 valid_addresses.append(addr)
             else:
                 sanitized_addr = sanitize_for_logging(addr)
@@ -93,6 +186,17 @@ def parse_email_addresses(addresses_raw: str) -> List[str]:
     
     return valid_addresses
 
+def _to_bool(value: str) -> bool:
+    """Interpret a 'true'/'false' configuration string"""
+    return value.lower() == 'true'
+
+def _parameter_store_property(attr_name: str) -> cached_property:
+    """Create a Config attribute that triggers the bulk Parameter Store load on first access"""
+    def load(self):
+        self._load_parameter_store_values()
+        return self.__dict__[attr_name]
+    return cached_property(load)
+
 class Config:
     """Configuration class for Exchange EWS Connector"""
     
@@ -115,7 +219,6 @@ class Config:
         
         # HTML Processing Performance Configuration
         'HTML_PROCESSING_THRESHOLD': '100000',  # 100KB
-        'HTML_CHUNK_SIZE': '500000',  # 500KB chunks
         'MAX_CONTENT_SIZE_MB': '10',  # 10MB max
         
         # Q Business Sync Job Conflict Resolution
@@ -132,73 +235,109 @@ class Config:
         'ENABLE_THREADING': 'true',  # Enable parallel processing
         'MAX_WORKER_THREADS': '4',   # Maximum number of worker threads
         'THREAD_BATCH_SIZE': '50',   # Number of emails per thread batch
+        'MAX_FOLDER_WORKERS': '4',   # Number of folders processed at once per account
         
         # Distributed Sync Job Configuration
         'SYNC_JOB_HEARTBEAT_INTERVAL': '30',  # Heartbeat interval in seconds
         'SYNC_JOB_STALE_THRESHOLD': '600',    # Consider sync job stale after 10 minutes
     }
     
-    def __init__(self):
+    # Environment-driven settings: (attribute name, DEFAULT_VALUES key, caster)
+    ENV_SCHEMA = [
         # Environment Configuration
-        self.environment = os.environ.get('ENVIRONMENT', self.DEFAULT_VALUES['ENVIRONMENT'])
+        ('environment', 'ENVIRONMENT', str),
         
-        # DynamoDB configuration
-        self.table_name = os.environ.get('DYNAMODB_TABLE_NAME', self.DEFAULT_VALUES['DYNAMODB_TABLE_NAME'])
+        # DynamoDB Configuration
+        ('table_name', 'DYNAMODB_TABLE_NAME', str),
         
         # AWS Region
-        self.aws_region = os.environ.get('AWS_DEFAULT_REGION', self.DEFAULT_VALUES['AWS_DEFAULT_REGION'])
+        ('aws_region', 'AWS_DEFAULT_REGION', str),
         
-        # Parameter Store prefix - dynamically based on environment
-        self.parameter_store_prefix = os.environ.get('PARAMETER_STORE_PREFIX', f'/exchange-connector/{self.environment}')
-        
-        # Q Business configuration (from Parameter Store)
-        self.application_id = get_parameter_from_store('QBUSINESS_APPLICATION_ID')
-        self.index_id = get_parameter_from_store('QBUSINESS_INDEX_ID')
-        self.data_source_id = get_parameter_from_store('QBUSINESS_DATASOURCE_ID')
-        
-        # Exchange configuration (from Parameter Store)
-        self.client_id = get_parameter_from_store('EXCHANGE_CLIENT_ID')
-        self.client_secret = get_parameter_from_store('EXCHANGE_CLIENT_SECRET')
-        self.tenant_id = get_parameter_from_store('EXCHANGE_TENANT_ID')
-        self.exchange_server = get_parameter_from_store('EXCHANGE_SERVER', 'outlook.office365.com')
+        # Sync Mode Configuration
+        ('sync_mode', 'SYNC_MODE', str.lower),
         
-        # Parse email addresses (from Parameter Store)
-        primary_smtp_addresses_raw = get_parameter_from_store('EXCHANGE_PRIMARY_SMTP_ADDRESS')
-        self.primary_smtp_addresses = parse_email_addresses(primary_smtp_addresses_raw)
+        # HTML Processing Performance Configuration
+        ('html_processing_threshold', 'HTML_PROCESSING_THRESHOLD', int),
+        ('max_content_size_mb', 'MAX_CONTENT_SIZE_MB', int),
         
-        # Processing limits (0 means no limit - process all emails)
-        limit_str = os.environ.get('EMAIL_PROCESSING_LIMIT', '0')
+        # Q Business Sync Job Conflict Resolution
+        ('auto_resolve_sync_conflicts', 'AUTO_RESOLVE_SYNC_CONFLICTS', _to_bool),
+        ('max_sync_conflict_retries', 'MAX_SYNC_CONFLICT_RETRIES', int),
         
-        self.testing_email_limit = int(limit_str) if limit_str != '0' else None
+        # Document Processing Configuration
+        ('document_batch_size', 'DOCUMENT_BATCH_SIZE', int),
         
-        # Sync mode configuration
-        self.sync_mode = os.environ.get('SYNC_MODE', self.DEFAULT_VALUES['SYNC_MODE']).lower()
+        # Folder Processing Configuration
+        ('process_main_mailbox', 'PROCESS_MAIN_MAILBOX', _to_bool),
         
-
+        # Threading Configuration
+        ('enable_threading', 'ENABLE_THREADING', _to_bool),
+        ('max_worker_threads', 'MAX_WORKER_THREADS', int),
+        ('thread_batch_size', 'THREAD_BATCH_SIZE', int),
+        ('max_folder_workers', 'MAX_FOLDER_WORKERS', int),
         
-        # HTML processing configuration
-        self.html_processing_threshold = int(os.environ.get('HTML_PROCESSING_THRESHOLD', self.DEFAULT_VALUES['HTML_PROCESSING_THRESHOLD']))
-        self.html_chunk_size = int(os.environ.get('HTML_CHUNK_SIZE', self.DEFAULT_VALUES['HTML_CHUNK_SIZE']))
-        self.max_content_size_mb = int(os.environ.get('MAX_CONTENT_SIZE_MB', self.DEFAULT_VALUES['MAX_CONTENT_SIZE_MB']))
+        # Distributed Sync Job Configuration
+        ('sync_job_heartbeat_interval', 'SYNC_JOB_HEARTBEAT_INTERVAL', int),
+        ('sync_job_stale_threshold', 'SYNC_JOB_STALE_THRESHOLD', int),
+    ]
+    
+    # Attributes loaded from Parameter Store: attribute name -> parameter name
+    PARAMETER_STORE_ATTRIBUTES = {
+        'application_id': 'QBUSINESS_APPLICATION_ID',
+        'index_id': 'QBUSINESS_INDEX_ID',
+        'data_source_id': 'QBUSINESS_DATASOURCE_ID',
+        'client_id': 'EXCHANGE_CLIENT_ID',
+        'client_secret': 'EXCHANGE_CLIENT_SECRET',
+        'tenant_id': 'EXCHANGE_TENANT_ID',
+        'exchange_server': 'EXCHANGE_SERVER',
+        'primary_smtp_addresses': 'EXCHANGE_PRIMARY_SMTP_ADDRESS',
+    }
+    
+    # Defaults for Parameter Store values not found anywhere else
+    PARAMETER_STORE_DEFAULTS = {
+        'EXCHANGE_SERVER': 'outlook.office365.com',
+    }
+    
+    # Q Business configuration (from Parameter Store, loaded on first access)
+    application_id = _parameter_store_property('application_id')
+    index_id = _parameter_store_property('index_id')
+    data_source_id = _parameter_store_property('data_source_id')
+    
+    # Exchange configuration (from Parameter Store, loaded on first access)
+    client_id = _parameter_store_property('client_id')
+    client_secret = _parameter_store_property('client_secret')
+    tenant_id = _parameter_store_property('tenant_id')
+    exchange_server = _parameter_store_property('exchange_server')
+    primary_smtp_addresses = _parameter_store_property('primary_smtp_addresses')
+    
+    def __init__(self):
+        # Environment-driven settings, coerced according to ENV_SCHEMA
+        environ = os.environ
+        defaults = self.DEFAULT_VALUES
+        for attr_name, env_name, caster in self.ENV_SCHEMA:
+            setattr(self, attr_name, caster(environ.get(env_name, defaults[env_name])))
         
-        # Q Business sync job configuration
-        self.auto_resolve_sync_conflicts = os.environ.get('AUTO_RESOLVE_SYNC_CONFLICTS', self.DEFAULT_VALUES['AUTO_RESOLVE_SYNC_CONFLICTS']).lower() == 'true'
-        self.max_sync_conflict_retries = int(os.environ.get('MAX_SYNC_CONFLICT_RETRIES', self.DEFAULT_VALUES['MAX_SYNC_CONFLICT_RETRIES']))
+        # Parameter Store prefix - dynamically based on environment
+        self.parameter_store_prefix = environ.get('PARAMETER_STORE_PREFIX', f'/exchange-connector/{self.environment}')
         
-        # Document processing batch configuration
-        self.document_batch_size = int(os.environ.get('DOCUMENT_BATCH_SIZE', self.DEFAULT_VALUES['DOCUMENT_BATCH_SIZE']))
+        # Processing limits (0 means no limit - process all emails)
+        limit_str = environ.get('EMAIL_PROCESSING_LIMIT', '0')
         
-        # Folder processing configuration
-        self.process_main_mailbox = os.environ.get('PROCESS_MAIN_MAILBOX', self.DEFAULT_VALUES['PROCESS_MAIN_MAILBOX']).lower() == 'true'
+        self.testing_email_limit = int(limit_str) if limit_str != '0' else None
+    
+    def _load_parameter_store_values(self) -> None:
+        """Load all Parameter Store attributes with one batched call and cache them on the instance"""
+        parameters = get_parameters_from_store(
+            list(self.PARAMETER_STORE_ATTRIBUTES.values()), self.PARAMETER_STORE_DEFAULTS
+        )
+        loaded = {attr_name: parameters[name] for attr_name, name in self.PARAMETER_STORE_ATTRIBUTES.items()}
         
-        # Threading configuration
-        self.enable_threading = os.environ.get('ENABLE_THREADING', self.DEFAULT_VALUES['ENABLE_THREADING']).lower() == 'true'
-        self.max_worker_threads = int(os.environ.get('MAX_WORKER_THREADS', self.DEFAULT_VALUES['MAX_WORKER_THREADS']))
-        self.thread_batch_size = int(os.environ.get('THREAD_BATCH_SIZE', self.DEFAULT_VALUES['THREAD_BATCH_SIZE']))
+        # Parse email addresses
+        loaded['primary_smtp_addresses'] = parse_email_addresses(loaded['primary_smtp_addresses'])
         
-        # Distributed sync job configuration
-        self.sync_job_heartbeat_interval = int(os.environ.get('SYNC_JOB_HEARTBEAT_INTERVAL', self.DEFAULT_VALUES['SYNC_JOB_HEARTBEAT_INTERVAL']))
-        self.sync_job_stale_threshold = int(os.environ.get('SYNC_JOB_STALE_THRESHOLD', self.DEFAULT_VALUES['SYNC_JOB_STALE_THRESHOLD']))
+        # Keep any attribute that was already loaded or overridden on this instance
+        for attr_name, value in loaded.items():
+            self.__dict__.setdefault(attr_name, value)
         
         # Validate configuration
         self._validate_config()
@@ -207,9 +346,10 @@ class Config:
         """Validate required configuration parameters"""
         if not self.primary_smtp_addresses:
             logger.error("No valid email addresses configured. Please check EXCHANGE_PRIMARY_SMTP_ADDRESS")
-        else:
-            # Log count only, not actual addresses for security
-            logger.info(f"Configured {len(self.primary_smtp_addresses)} email address(es)")
+            return
+        
+        # Log count only, not actual addresses for security
+        logger.info("Configured %d email address(es)", len(self.primary_smtp_addresses))
     
     def get_required_vars(self) -> dict:
         """Get dictionary of required variables for validation"""
@@ -225,23 +365,26 @@ class Config:
     
     def display_config(self) -> None:
         """Display current configuration (excluding sensitive values)"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
         logger.info("Current Configuration:")
-        logger.info(f"  Environment: {self.environment}")
-        logger.info(f"  DynamoDB Table: {self.table_name}")
-        logger.info(f"  AWS Region: {self.aws_region}")
-        logger.info(f"  Parameter Store Prefix: {sanitize_for_logging(self.parameter_store_prefix)}")
-        logger.info(f"  Email Processing Limit: {self.testing_email_limit or 'No limit'}")
-        logger.info(f"  Sync Mode: {self.sync_mode}")
-        logger.info(f"  Exchange Server: {self.exchange_server}")
-        logger.info(f"  Email Addresses: {len(self.primary_smtp_addresses)} configured")
-        logger.info(f"  HTML Processing Threshold: {self.html_processing_threshold:,} chars")
-        logger.info(f"  HTML Chunk Size: {self.html_chunk_size:,} chars")
-        logger.info(f"  Max Content Size: {self.max_content_size_mb} MB")
-        logger.info(f"  Auto Resolve Sync Conflicts: {self.auto_resolve_sync_conflicts}")
-        logger.info(f"  Max Sync Conflict Retries: {self.max_sync_conflict_retries}")
-        logger.info(f"  Document Batch Size: {self.document_batch_size}")
-        logger.info(f"  Process Main Mailbox: {self.process_main_mailbox}")
-        logger.info(f"  Threading Enabled: {self.enable_threading}")
-        logger.info(f"  Max Worker Threads: {self.max_worker_threads}")
-        logger.info(f"  Sync Job Heartbeat Interval: {self.sync_job_heartbeat_interval}s")
-        logger.info(f"  Sync Job Stale Threshold: {self.sync_job_stale_threshold}s")
+        logger.info("  Environment: %s", self.environment)
+        logger.info("  DynamoDB Table: %s", self.table_name)
+        logger.info("  AWS Region: %s", self.aws_region)
+        logger.info("  Parameter Store Prefix: %s", sanitize_for_logging(self.parameter_store_prefix))
+        logger.info("  Email Processing Limit: %s", self.testing_email_limit or 'No limit')
+        logger.info("  Sync Mode: %s", self.sync_mode)
+        logger.info("  Exchange Server: %s", self.exchange_server)
+        logger.info("  Email Addresses: %d configured", len(self.primary_smtp_addresses))
+        logger.info("  HTML Processing Threshold: %s chars", f"{self.html_processing_threshold:,}")
+        logger.info("  Max Content Size: %s MB", self.max_content_size_mb)
+        logger.info("  Auto Resolve Sync Conflicts: %s", self.auto_resolve_sync_conflicts)
+        logger.info("  Max Sync Conflict Retries: %s", self.max_sync_conflict_retries)
+        logger.info("  Document Batch Size: %s", self.document_batch_size)
+        logger.info("  Process Main Mailbox: %s", self.process_main_mailbox)
+        logger.info("  Threading Enabled: %s", self.enable_threading)
+        logger.info("  Max Worker Threads: %s", self.max_worker_threads)
+        logger.info("  Max Folder Workers: %s", self.max_folder_workers)
+        logger.info("  Sync Job Heartbeat Interval: %ss", self.sync_job_heartbeat_interval)
+        logger.info("  Sync Job Stale Threshold: %ss", self.sync_job_stale_threshold)
@@ -3,26 +3,187 @@ Document Processor Module
 Handles email processing and conversion to Q Business documents
 """
 
+import os
 import re
 import io
+import html
 import time
+import zipfile
 import base64
 import logging
-from datetime import datetime, timezone
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, List
 from .security_utils import sanitize_html_content, handle_error_securely, validate_email_content, _sanitize_text_content
 
 # Document processing libraries (optional)
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+# PyMuPDF is not thread-safe; documents are built on worker threads, so only one PDF is parsed at a time
+_PYMUPDF_LOCK = threading.Lock()
+
 try:
     import PyPDF2
-    from docx import Document as DocxDocument
-    import pandas as pd
+    PYPDF2_AVAILABLE = True
+except ImportError:
+    PYPDF2_AVAILABLE = False
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
     import openpyxl
-except ImportError as e:
-    print(f"Warning: Some document parsing libraries not available: {e}")
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+try:
+    import pybase64  # SIMD-accelerated drop-in for base64.b64encode
+    _b64encode = pybase64.b64encode
+except ImportError:
+    _b64encode = base64.b64encode
+
+try:
+    from charset_normalizer import from_bytes as detect_charset
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
+
+try:
+    from exchangelib import EWSDate, EWSDateTime, EWSTimeZone
+    EXCHANGELIB_AVAILABLE = True
+except ImportError:
+    EXCHANGELIB_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# HTML to text conversion patterns, compiled once at import
+_RE_SCRIPT_STYLE = re.compile(r'<(script|style)[^>]*>.*?</\1>', re.DOTALL | re.IGNORECASE)
+_RE_TAG = re.compile(r'<[^>]+>')
+_RE_HORIZONTAL_WHITESPACE = re.compile(r'[ \t]+')
+_RE_ANY_WHITESPACE = re.compile(r'\s+')
+_RE_BLANK_LINES = re.compile(r'\n\s*\n\s*\n+')
+_RE_DOUBLE_NEWLINE = re.compile(r'\n\s*\n')
+
+# Content quality clean-up patterns
+_RE_SENTENCE_BREAK = re.compile(r'([.!?])\s*([A-Z])')
+_RE_CAMEL_CASE_JOIN = re.compile(r'([a-z])([A-Z])')
+_RE_SIGNATURE = re.compile(r'\n\s*--+\s*\n.*', re.DOTALL)
+_RE_DISCLAIMER = re.compile(r'\n\s*This email.*confidential.*', re.DOTALL | re.IGNORECASE)
+
+# Tags that mark a body as HTML, and how far into the body to look for them
+_RE_HTML_SNIFF = re.compile(r'<(?:html|body|div|p|br|span|table|tr|td)\b', re.IGNORECASE)
+HTML_SNIFF_LENGTH = 4096
+
+# Matches a whole script/style element or any single tag, so every tag
+# transform happens in one scan via _replace_html_tag
+_RE_HTML_TAG = re.compile(
+    r'<(script|style)[^>]*>.*?</\1>|<(?!>)(/?)([a-z][a-z0-9]*)?[^>]*>',
+    re.DOTALL | re.IGNORECASE
+)
+
+# Text that replaces opening and closing tags; any other tag is removed
+_OPENING_TAG_TEXT = {
+    'br': '\n',
+    'p': '\n\n',
+    'div': '\n',
+    'li': '\n• ',
+    'tr': '\n',
+    'td': '\t',
+    **{f'h{level}': '\n\n' for level in range(1, 7)},
+}
+_CLOSING_TAG_TEXT = {f'h{level}': '\n' for level in range(1, 7)}
+
+def _replace_html_tag(match) -> str:
+    """Map a tag matched by _RE_HTML_TAG to its plain text equivalent"""
+    tag_name = match.group(3)
+    if match.group(1) or not tag_name:
+        return ''
+    if match.group(2):
+        return _CLOSING_TAG_TEXT.get(tag_name.lower(), '')
+    return _OPENING_TAG_TEXT.get(tag_name.lower(), '')
+
+def _decode_html_entities(text: str) -> str:
+    """Decode all named and numeric HTML entities, mapping non-breaking spaces to plain spaces"""
+    if '&' not in text:
+        return text
+    return html.unescape(text).replace('\xa0', ' ')
+
+# Reply/forward prefix removed from subjects for titles and thread topics
+_RE_SUBJECT_PREFIX = re.compile(r'^(RE:|FW:|FWD:)\s*', re.IGNORECASE)
+_SUBJECT_PREFIXES = ('RE:', 'FW:', 'FWD:')
+
+def _strip_reply_prefix(subject: str) -> str:
+    """Remove a leading RE:/FW:/FWD: prefix, skipping the regex for the many subjects without one"""
+    if subject[:4].upper().startswith(_SUBJECT_PREFIXES):
+        return _RE_SUBJECT_PREFIX.sub('', subject, count=1).strip()
+    return subject.strip()
+
+# Time period buckets as (maximum whole days ago, label), checked in order
+_TIME_PERIODS = (
+    (1, 'today'),
+    (7, 'this_week'),
+    (30, 'this_month'),
+    (90, 'last_3_months'),
+    (365, 'this_year'),
+)
+
+@lru_cache(maxsize=1024)
+def _parse_iso_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp; forwarded threads repeat the same header values, so results are cached"""
+    return datetime.fromisoformat(value)
+
+# Subject keywords for each content category; a category listed earlier wins when several match
+_CONTENT_CATEGORY_KEYWORDS = {
+    'meeting': ('meeting', 'calendar', 'appointment', 'schedule'),
+    'project': ('project', 'task', 'deadline', 'deliverable'),
+    'document': ('report', 'document', 'analysis', 'review'),
+    'notification': ('notification', 'alert', 'reminder', 'update'),
+}
+_CONTENT_CATEGORY_PRIORITY = {category: rank for rank, category in enumerate(_CONTENT_CATEGORY_KEYWORDS)}
+# Lookahead so overlapping keywords (e.g. "alertask") are all seen, as with plain substring checks
+_RE_CONTENT_CATEGORY = re.compile(
+    '(?=' + '|'.join(f"(?P<{category}>{'|'.join(words)})" for category, words in _CONTENT_CATEGORY_KEYWORDS.items()) + ')',
+    re.IGNORECASE
+)
+
+def _decode_body(body) -> str:
+    """Return an email body as text, decoding raw bytes instead of producing a "b'...'" repr"""
+    if isinstance(body, str):
+        return body
+    if isinstance(body, (bytes, bytearray)):
+        try:
+            return body.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+        if CHARSET_NORMALIZER_AVAILABLE:
+            best_match = detect_charset(bytes(body)).best()
+            if best_match is not None:
+                return str(best_match)
+        return body.decode('utf-8', errors='replace')
+    return str(body)
+
+# WordprocessingML tags read when extracting DOCX text
+_WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_DOCX_PARAGRAPH_TAG = _WORD_NAMESPACE + 'p'
+_DOCX_TEXT_TAG = _WORD_NAMESPACE + 't'
+
 class DocumentProcessor:
     """Processes Exchange emails and converts them to Q Business documents"""
     
@@ -33,50 +194,96 @@ class DocumentProcessor:
         self.process_attachments = getattr(config, 'process_attachments', True)
         self.supported_attachment_types = getattr(config, 'supported_attachment_types', 
                                             ['.pdf', '.docx', '.doc', '.xlsx', '.xls'])
+        self._ext_set = frozenset(ext.lower() for ext in self.supported_attachment_types)
+        self.attachment_workers = getattr(config, 'attachment_workers', 4)
+        # (now, time period cut-offs) for the most recent reference time used by _get_time_period
+        self._time_period_bounds = (None, ())
+        # account_email -> access control list, reused by every document of that account
+        self._acl_cache: Dict[str, List[Dict]] = {}
+        
+        # File extension -> (human-readable description, text extractor or None)
+        self._file_type_dispatch = {
+            '.pdf': ('PDF Document', self.extract_text_from_pdf),
+            '.docx': ('Word Document', self.extract_text_from_docx),
+            '.doc': ('Word Document', self.extract_text_from_docx),
+            '.xlsx': ('Excel Spreadsheet', self.extract_text_from_excel),
+            '.xls': ('Excel Spreadsheet', self.extract_text_from_excel),
+            '.pptx': ('PowerPoint Presentation', None),
+            '.ppt': ('PowerPoint Presentation', None),
+        }
 
     def extract_text_from_pdf(self, content_bytes: bytes) -> str:
         """Extract text from PDF attachment"""
         try:
-            import PyPDF2
+            if PYMUPDF_AVAILABLE:
+                # MuPDF parses the raw bytes in native code, no file-like wrapper needed
+                with _PYMUPDF_LOCK:
+                    with fitz.open(stream=content_bytes, filetype="pdf") as pdf_document:
+                        return "\n".join([page.get_text("text") for page in pdf_document]).strip()
+            
+            if not PYPDF2_AVAILABLE:
+                print("PyMuPDF/PyPDF2 not installed, skipping PDF text extraction")
+                return ""
+            
             pdf_reader = PyPDF2.PdfReader(io.BytesIO(content_bytes))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
-        except ImportError:
-            print("PyPDF2 not installed, skipping PDF text extraction")
-            return ""
+            pages = [page.extract_text() for page in pdf_reader.pages]
+            return "\n".join(pages).strip()
         except Exception as e:
             print(f"Error extracting PDF text: {e}")
             return "" 
 
     def extract_text_from_docx(self, content_bytes: bytes) -> str:
         """Extract text from Word document attachment"""
-        try:
-            from docx import Document as DocxDocument
-            doc = DocxDocument(io.BytesIO(content_bytes))
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            return text.strip()
-        except ImportError:
-            print("python-docx not installed, skipping DOCX text extraction")
+        if not LXML_AVAILABLE:
+            print("lxml not installed, skipping DOCX text extraction")
             return ""
+        
+        try:
+            # Stream word/document.xml and keep only text runs, one line per paragraph
+            paragraphs = []
+            runs = []
+            with zipfile.ZipFile(io.BytesIO(content_bytes)) as docx_zip:
+                with docx_zip.open('word/document.xml') as document_xml:
+                    for _, element in etree.iterparse(document_xml, events=('end',),
+                                                      tag=(_DOCX_PARAGRAPH_TAG, _DOCX_TEXT_TAG),
+                                                      resolve_entities=False, no_network=True):
+                        if element.tag == _DOCX_TEXT_TAG:
+                            runs.append(element.text or '')
+                            continue
+                        
+                        paragraphs.append(''.join(runs))
+                        runs = []
+                        
+                        # Release finished paragraphs so memory stays bounded
+                        element.clear()
+                        while element.getprevious() is not None:
+                            del element.getparent()[0]
+            
+            return "\n".join(paragraphs).strip()
         except Exception as e:
             print(f"Error extracting DOCX text: {e}")
             return ""
 
     def extract_text_from_excel(self, content_bytes: bytes) -> str:
         """Extract text from Excel attachment"""
-        try:
-            import pandas as pd
-            df = pd.read_excel(io.BytesIO(content_bytes), sheet_name=None)
-            text = ""
-            for sheet_name, sheet_df in df.items():
-                text += f"Sheet: {sheet_name}\n"
-                text += sheet_df.to_string(index=False) + "\n\n"
-            return text.strip()
-        except ImportError:
-            print("pandas/openpyxl not installed, skipping Excel text extraction")
+        if not OPENPYXL_AVAILABLE:
+            print("openpyxl not installed, skipping Excel text extraction")
             return ""
+        
+        try:
+            # Read-only mode streams rows instead of loading the whole workbook
+            workbook = openpyxl.load_workbook(io.BytesIO(content_bytes), read_only=True, data_only=True)
+            try:
+                text = io.StringIO()
+                for worksheet in workbook.worksheets:
+                    text.write(f"Sheet: {worksheet.title}\n")
+                    for row in worksheet.iter_rows(values_only=True):
+                        text.write("\t".join("" if value is None else str(value) for value in row))
+                        text.write("\n")
+                    text.write("\n")
+            finally:
+                workbook.close()
+            return text.getvalue().strip()
         except Exception as e:
             print(f"Error extracting Excel text: {e}")
             return ""
@@ -155,8 +362,8 @@ Content:
     def _extract_attachment_text(self, content_bytes: bytes, filename: str) -> str:
         """Extract text from attachment based on file type"""
         # Skip non-document attachments
-        supported_extensions = ['.pdf', '.docx', '.doc', '.xlsx', '.xls']
-        if not any(filename.endswith(ext) for ext in supported_extensions):
+        ext = os.path.splitext(filename)[1].lower()
+        if ext not in self._ext_set:
             print(f"Skipping unsupported attachment type")
             return ""
         
@@ -164,12 +371,9 @@ Content:
         
         # Extract text based on file type
         text_content = ""
-        if filename.endswith('.pdf'):
-            text_content = self.extract_text_from_pdf(content_bytes)
-        elif filename.endswith(('.docx', '.doc')):
-            text_content = self.extract_text_from_docx(content_bytes)
-        elif filename.endswith(('.xlsx', '.xls')):
-            text_content = self.extract_text_from_excel(content_bytes)
+        _, extractor = self._file_type_dispatch.get(ext, (None, None))
+        if extractor:
+            text_content = extractor(content_bytes)
         
         if not text_content:
             print(f"No text extracted from attachment")
@@ -178,22 +382,18 @@ Content:
     
     def _get_file_type_description(self, filename: str) -> str:
         """Get human-readable file type description"""
-        if filename.endswith('.pdf'):
-            return 'PDF Document'
-        elif filename.endswith(('.docx', '.doc')):
-            return 'Word Document'
-        elif filename.endswith(('.xlsx', '.xls')):
-            return 'Excel Spreadsheet'
-        elif filename.endswith(('.pptx', '.ppt')):
-            return 'PowerPoint Presentation'
-        else:
-            return 'Document'
+        file_type = self._file_type_dispatch.get(os.path.splitext(filename)[1].lower())
+        return file_type[0] if file_type else 'Document'
 
     def html_to_text(self, html_content: str) -> str:
         """Convert HTML content to plain text using optimized approach"""
         if not html_content:
             return ""
         
+        # Near-plaintext bodies (e.g. a stray "<div" in a signature) only need their few tags and entities handled
+        if html_content.count('<') < 3:
+            return _decode_html_entities(_RE_HTML_TAG.sub(_replace_html_tag, html_content)).strip()
+        
         start_time = time.time()
         content_size = len(html_content)
         
@@ -202,7 +402,10 @@ Content:
         
         if content_size > threshold:
             print(f"Large HTML content detected ({content_size} chars), using optimized conversion...")
-            result = self._fast_html_to_text(html_content)
+            if SELECTOLAX_AVAILABLE:
+                result = self._parser_html_to_text(html_content)
+            else:
+                result = self._fast_html_to_text(html_content)
         else:
             result = self._standard_html_to_text(html_content)
         
@@ -211,145 +414,66 @@ Content:
         
         return result
     
+    def _parser_html_to_text(self, html_content: str) -> str:
+        """HTML to text conversion for large content using the native selectolax parser"""
+        tree = HTMLParser(html_content)
+        tree.strip_tags(['script', 'style'])
+        root = tree.body or tree.root
+        if root is None:
+            return ""
+        
+        # The parser decodes entities itself; only blank lines need collapsing
+        text = root.text(separator='\n', strip=True)
+        return _RE_BLANK_LINES.sub('\n\n', text).strip()
+    
     def _fast_html_to_text(self, html_content: str) -> str:
         """Fast HTML to text conversion for large content"""
-        # Use configurable chunk size threshold
-        chunk_threshold = getattr(self.config, 'html_chunk_size', 500000) * 2  # 2x chunk size as threshold
-        
-        # For extremely large content, use chunked processing
-        if len(html_content) > chunk_threshold:
-            return self._chunked_html_to_text(html_content)
-        
-        # Pre-compile regex patterns for better performance
-        if not hasattr(self, '_compiled_patterns'):
-            self._compiled_patterns = {
-                'script_style': re.compile(r'<(script|style)[^>]*>.*?</\1>', re.DOTALL | re.IGNORECASE),
-                'block_elements': re.compile(r'<(br|p|div|h[1-6]|tr)[^>]*>', re.IGNORECASE),
-                'list_items': re.compile(r'<li[^>]*>', re.IGNORECASE),
-                'table_cells': re.compile(r'<td[^>]*>', re.IGNORECASE),
-                'all_tags': re.compile(r'<[^>]+>'),
-                'entities': re.compile(r'&(nbsp|amp|lt|gt|quot|#39);'),
-                'whitespace': re.compile(r'[ \t]+'),
-                'newlines': re.compile(r'\n\s*\n\s*\n+')
-            }
-        
-        # Remove script and style elements first
-        html_content = self._compiled_patterns['script_style'].sub('', html_content)
-        
-        # Convert block elements to newlines in one pass
-        html_content = self._compiled_patterns['block_elements'].sub('\n', html_content)
-        html_content = self._compiled_patterns['list_items'].sub('\n• ', html_content)
-        html_content = self._compiled_patterns['table_cells'].sub('\t', html_content)
-        
-        # Remove all remaining HTML tags
-        html_content = self._compiled_patterns['all_tags'].sub('', html_content)
-        
-        # Decode HTML entities using a single regex pass for better performance
-        if '&' in html_content:  # Only process if entities are present
-            entity_map = {'nbsp': ' ', 'amp': '&', 'lt': '<', 'gt': '>', 'quot': '"', '#39': "'"}
-            def replace_entity(match):
-                entity = match.group(1)
-                return entity_map.get(entity, match.group(0))
-            html_content = re.sub(r'&(nbsp|amp|lt|gt|quot|#39);', replace_entity, html_content)
+        # Single streaming pass at every size; oversized bodies are truncated before conversion
+        # Drop script/style elements, convert block tags and strip all other tags in one pass
+        html_content = _RE_HTML_TAG.sub(_replace_html_tag, html_content)
+        
+        # Decode HTML entities
+        html_content = _decode_html_entities(html_content)
         
         # Clean up whitespace in two passes
-        html_content = self._compiled_patterns['whitespace'].sub(' ', html_content)
-        html_content = self._compiled_patterns['newlines'].sub('\n\n', html_content)
+        html_content = _RE_HORIZONTAL_WHITESPACE.sub(' ', html_content)
+        html_content = _RE_BLANK_LINES.sub('\n\n', html_content)
         
         return html_content.strip()
     
-    def _chunked_html_to_text(self, html_content: str) -> str:
-        """Process extremely large HTML content in chunks to avoid memory issues"""
-        print(f"Processing extremely large HTML content ({len(html_content)} chars) in chunks...")
-        
-        # First, remove script and style elements from the entire content
-        # This is important to do first to avoid processing their content
-        html_content = re.sub(r'<(script|style)[^>]*>.*?</\1>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
-        
-        # Use configurable chunk size
-        chunk_size = getattr(self.config, 'html_chunk_size', 500000)
-        chunks = []
-        
-        for i in range(0, len(html_content), chunk_size):
-            chunk = html_content[i:i + chunk_size]
-            
-            # Process chunk with simplified regex operations
-            # Convert block elements to newlines
-            chunk = re.sub(r'<(br|p|div|h[1-6]|tr)[^>]*>', '\n', chunk, flags=re.IGNORECASE)
-            chunk = re.sub(r'<li[^>]*>', '\n• ', chunk, flags=re.IGNORECASE)
-            chunk = re.sub(r'<td[^>]*>', '\t', chunk, flags=re.IGNORECASE)
-            
-            # Remove all HTML tags
-            chunk = re.sub(r'<[^>]+>', '', chunk)
-            
-            # Basic entity decoding
-            chunk = chunk.replace('&nbsp;', ' ').replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"').replace('&#39;', "'")
-            
-            chunks.append(chunk)
-        
-        # Join chunks and clean up whitespace
-        result = ''.join(chunks)
-        result = re.sub(r'[ \t]+', ' ', result)
-        result = re.sub(r'\n\s*\n\s*\n+', '\n\n', result)
-        
-        print(f"Chunked processing completed, result size: {len(result)} chars")
-        return result.strip()
-    
     def _simple_html_strip(self, html_content: str) -> str:
         """Ultra-fast HTML stripping for emergency fallback"""
         # Remove script and style content
-        html_content = re.sub(r'<(script|style)[^>]*>.*?</\1>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
+        html_content = _RE_SCRIPT_STYLE.sub('', html_content)
         
         # Convert line breaks
         html_content = html_content.replace('<br>', '\n').replace('<br/>', '\n').replace('<br />', '\n')
         html_content = html_content.replace('</p>', '\n').replace('</div>', '\n')
         
         # Strip all remaining tags
-        html_content = re.sub(r'<[^>]+>', '', html_content)
+        html_content = _RE_TAG.sub('', html_content)
         
-        # Basic entity decoding
-        html_content = html_content.replace('&nbsp;', ' ').replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"')
+        # Decode HTML entities
+        html_content = _decode_html_entities(html_content)
         
         # Clean whitespace
-        html_content = re.sub(r'\s+', ' ', html_content)
-        html_content = re.sub(r'\n\s*\n', '\n\n', html_content)
+        html_content = _RE_ANY_WHITESPACE.sub(' ', html_content)
+        html_content = _RE_DOUBLE_NEWLINE.sub('\n\n', html_content)
         
         return html_content.strip()
     
     def _standard_html_to_text(self, html_content: str) -> str:
         """Standard HTML to text conversion for smaller content"""
-        # Remove script and style elements
-        html_content = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
-        html_content = re.sub(r'<style[^>]*>.*?</style>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
-        
-        # Convert common HTML elements to text equivalents
-        html_content = re.sub(r'<br[^>]*>', '\n', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'<p[^>]*>', '\n\n', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'</p>', '', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'<div[^>]*>', '\n', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'</div>', '', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'<h[1-6][^>]*>', '\n\n', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'</h[1-6]>', '\n', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'<li[^>]*>', '\n• ', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'</li>', '', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'<tr[^>]*>', '\n', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'<td[^>]*>', '\t', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'</td>', '', html_content, flags=re.IGNORECASE)
-        
-        # Remove all remaining HTML tags
-        html_content = re.sub(r'<[^>]+>', '', html_content)
+        # Remove script/style elements, convert common HTML elements to text
+        # equivalents and remove all remaining tags in a single pass
+        html_content = _RE_HTML_TAG.sub(_replace_html_tag, html_content)
         
         # Decode HTML entities
-        html_content = html_content.replace('&nbsp;', ' ')
-        html_content = html_content.replace('&amp;', '&')
-        html_content = html_content.replace('&lt;', '<')
-        html_content = html_content.replace('&gt;', '>')
-        html_content = html_content.replace('&quot;', '"')
-        html_content = html_content.replace('&#39;', "'")
+        html_content = _decode_html_entities(html_content)
         
         # Clean up whitespace
-        html_content = re.sub(r'\n\s*\n\s*\n', '\n\n', html_content)  # Multiple newlines to double
-        html_content = re.sub(r'[ \t]+', ' ', html_content)  # Multiple spaces to single
+        html_content = _RE_BLANK_LINES.sub('\n\n', html_content)  # Multiple newlines to double
+        html_content = _RE_HORIZONTAL_WHITESPACE.sub(' ', html_content)  # Multiple spaces to single
         html_content = html_content.strip()
         
         return html_content
@@ -367,9 +491,13 @@ Content:
         try:
             if hasattr(dt_value, 'isoformat'):
                 # Handle exchangelib datetime objects specially
-                if (hasattr(dt_value, '__class__') and 
-                    ('exchangelib' in str(dt_value.__class__) or 
-                     hasattr(dt_value, 'tzinfo') and dt_value.tzinfo and 'EWSTimeZone' in str(type(dt_value.tzinfo)))):
+                if EXCHANGELIB_AVAILABLE:
+                    is_ews_value = (isinstance(dt_value, (EWSDateTime, EWSDate)) or
+                                    isinstance(getattr(dt_value, 'tzinfo', None), EWSTimeZone))
+                else:
+                    is_ews_value = ('exchangelib' in str(dt_value.__class__) or
+                                    hasattr(dt_value, 'tzinfo') and dt_value.tzinfo and 'EWSTimeZone' in str(type(dt_value.tzinfo)))
+                if is_ews_value:
                     # This is an exchangelib datetime object, use it directly
                     return dt_value.isoformat()
                 
@@ -410,7 +538,7 @@ Content:
         body_content = ''
         
         if hasattr(email, 'body') and email.body:
-            raw_body_content = str(email.body)
+            raw_body_content = _decode_body(email.body)
             raw_content_size = len(raw_body_content)
             
             logger.debug(f"Processing email body: {raw_content_size} characters")
@@ -424,10 +552,8 @@ Content:
                 max_chars = getattr(self.config, 'max_content_size_mb', 50) * 1000000
                 raw_body_content = raw_body_content[:max_chars] + "\n[Content truncated due to size limit]"
             
-            # Detect and convert HTML
-            body_lower = raw_body_content.lower().strip()
-            html_tags = ['<html', '<body', '<div', '<p>', '<br', '<span', '<table', '<tr', '<td']
-            body_is_html = any(tag in body_lower for tag in html_tags)
+            # Detect and convert HTML (markup always shows up near the start of an HTML body)
+            body_is_html = _RE_HTML_SNIFF.search(raw_body_content, 0, HTML_SNIFF_LENGTH) is not None
             
             if body_is_html:
                 try:
@@ -448,43 +574,71 @@ Content:
     
     def _process_email_attachments(self, email) -> str:
         """Process all email attachments"""
-        attachment_content = ""
+        attachment_results = []
         has_attachments = getattr(email, 'has_attachments', False)
         
         if has_attachments and hasattr(email, 'attachments'):
-            print(f"Processing {len(email.attachments)} attachments...")
-            for attachment in email.attachments:
-                attachment_text = self.process_attachment(attachment, str(email.id))
-                if attachment_text:
-                    attachment_content += attachment_text
+            attachments = list(email.attachments)
+            email_id = str(email.id)
+            print(f"Processing {len(attachments)} attachments...")
+            
+            # Extract attachments in parallel; map() keeps the original attachment order.
+            # PDFs still parse one at a time behind _PYMUPDF_LOCK, the other formats overlap freely
+            worker_count = min(self.attachment_workers, len(attachments))
+            if worker_count > 1:
+                with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                    attachment_results = list(executor.map(
+                        lambda attachment: self.process_attachment(attachment, email_id), attachments
+                    ))
+            else:
+                attachment_results = [self.process_attachment(attachment, email_id) for attachment in attachments]
         
-        return attachment_content
+        return "".join(text for text in attachment_results if text)
     
-    def _create_structured_email_content(self, email, body_content: str, attachment_content: str, folder_name: str, account_email: str) -> str:
+    def _snapshot_email_fields(self, email) -> Dict[str, Any]:
+        """Read every email attribute used for content, title and metadata in one pass"""
+        email_id = email.id
+        sender = getattr(email, 'sender', None)
+        to_recipients = getattr(email, 'to_recipients', None) or ()
+        cc_recipients = getattr(email, 'cc_recipients', None) or ()
+        bcc_recipients = getattr(email, 'bcc_recipients', None) or ()
+        datetime_sent = getattr(email, 'datetime_sent', None)
+        
+        return {
+            'id': email_id if isinstance(email_id, str) else str(email_id),
+            'subject': getattr(email, 'subject', '') or '',
+            'sender_name': getattr(sender, 'name', '') if sender else '',
+            'sender_email': getattr(sender, 'email_address', '') if sender else '',
+            'to_recipients': to_recipients,
+            'cc_recipients': cc_recipients,
+            'to_emails': self.get_email_addresses_list(to_recipients),
+            'cc_emails': self.get_email_addresses_list(cc_recipients),
+            'bcc_emails': self.get_email_addresses_list(bcc_recipients),
+            'datetime_sent': datetime_sent,
+            'sent_date': self.format_datetime(datetime_sent),
+            'importance': getattr(email, 'importance', ''),
+            'has_attachments': getattr(email, 'has_attachments', False),
+        }
+    
+    def _create_structured_email_content(self, fields: Dict[str, Any], body_content: str, attachment_content: str, folder_name: str, account_email: str) -> str:
         """Create well-structured content for better Q Business understanding"""
         
-        # Extract key information
-        subject = getattr(email, 'subject', '') or ''
-        sender_name = getattr(email.sender, 'name', '') if hasattr(email, 'sender') and email.sender else ''
-        sender_email = getattr(email.sender, 'email_address', '') if hasattr(email, 'sender') and email.sender else ''
-        sent_date = self.format_datetime(getattr(email, 'datetime_sent', None))
-        
         # Create structured content
         structured_parts = []
         
         # Email header section
         structured_parts.append("=== EMAIL DETAILS ===")
-        structured_parts.append(f"Subject: {subject}")
-        structured_parts.append(f"From: {sender_name} <{sender_email}>")
-        structured_parts.append(f"Date: {sent_date}")
+        structured_parts.append(f"Subject: {fields['subject']}")
+        structured_parts.append(f"From: {fields['sender_name']} <{fields['sender_email']}>")
+        structured_parts.append(f"Date: {fields['sent_date']}")
         
         # Recipients section
-        if hasattr(email, 'to_recipients') and email.to_recipients:
-            to_list = [f"{getattr(r, 'name', '')} <{getattr(r, 'email_address', '')}>" for r in email.to_recipients if r]
+        if fields['to_recipients']:
+            to_list = [f"{getattr(r, 'name', '')} <{getattr(r, 'email_address', '')}>" for r in fields['to_recipients'] if r]
             structured_parts.append(f"To: {'; '.join(to_list)}")
         
-        if hasattr(email, 'cc_recipients') and email.cc_recipients:
-            cc_list = [f"{getattr(r, 'name', '')} <{getattr(r, 'email_address', '')}>" for r in email.cc_recipients if r]
+        if fields['cc_recipients']:
+            cc_list = [f"{getattr(r, 'name', '')} <{getattr(r, 'email_address', '')}>" for r in fields['cc_recipients'] if r]
             structured_parts.append(f"CC: {'; '.join(cc_list)}")
         
         structured_parts.append("")  # Empty line
@@ -500,15 +654,15 @@ Content:
         
         return "\n".join(structured_parts)
     
-    def _create_enhanced_title(self, email, folder_name: str) -> str:
+    def _create_enhanced_title(self, fields: Dict[str, Any], folder_name: str) -> str:
         """Create descriptive title for better search relevance"""
-        subject = getattr(email, 'subject', '') or ''
-        sender_name = getattr(email.sender, 'name', '') if hasattr(email, 'sender') and email.sender else ''
+        subject = fields['subject']
+        sender_name = fields['sender_name']
         
         # Clean and enhance title
         if subject:
             # Remove common email prefixes
-            clean_subject = re.sub(r'^(RE:|FW:|FWD:)\s*', '', subject, flags=re.IGNORECASE).strip()
+            clean_subject = _strip_reply_prefix(subject)
             title = f"{clean_subject}"
             if sender_name:
                 title += f" (from {sender_name})"
@@ -521,38 +675,38 @@ Content:
         
         return self.clean_string(title)
     
-    def _create_enhanced_attributes(self, email, folder_name: str, account_email: str) -> List[Dict]:
+    def _create_enhanced_attributes(self, email, fields: Dict[str, Any], folder_name: str, account_email: str, now: datetime = None) -> List[Dict]:
         """Create comprehensive metadata attributes for better search and filtering"""
         
         # Get basic email info
-        sender_email = getattr(email.sender, 'email_address', '') if hasattr(email, 'sender') and email.sender else ''
-        subject = getattr(email, 'subject', '') or ''
-        has_attachments = getattr(email, 'has_attachments', False)
+        sender_email = fields['sender_email']
+        subject = fields['subject']
+        has_attachments = fields['has_attachments']
         is_read = getattr(email, 'is_read', False)
         
         attributes = [
             # Core Q Business fields
-            {'name': '_source_uri', 'value': {'stringValue': f"https://outlook.office365.com/owa/?ItemID={email.id}&exvsurl=1&viewmodel=ReadMessageItem"}},
+            {'name': '_source_uri', 'value': {'stringValue': f"https://outlook.office365.com/owa/?ItemID={fields['id']}&exvsurl=1&viewmodel=ReadMessageItem"}},
             {'name': '_created_at', 'value': {'dateValue': self.format_datetime(getattr(email, 'datetime_created', None))}},
             {'name': '_last_updated_at', 'value': {'dateValue': self.format_datetime(getattr(email, 'last_modified_time', None))}},
             {'name': '_category', 'value': {'stringValue': 'EMAIL'}},
             
             # Enhanced searchable fields
-            {'name': 'email_thread_topic', 'value': {'stringValue': self._extract_thread_topic(email)}},
-            {'name': 'email_priority', 'value': {'stringValue': self._get_email_priority(email)}},
-            {'name': 'email_content_type', 'value': {'stringValue': self._classify_email_content(email)}},
-            {'name': 'email_participants', 'value': {'stringListValue': self._get_all_participants(email)}},
-            {'name': 'email_domain_context', 'value': {'stringValue': self._extract_domain_context(email)}},
-            {'name': 'email_time_period', 'value': {'stringValue': self._get_time_period(email)}},
+            {'name': 'email_thread_topic', 'value': {'stringValue': self._extract_thread_topic(subject)}},
+            {'name': 'email_priority', 'value': {'stringValue': self._get_email_priority(fields['importance'])}},
+            {'name': 'email_content_type', 'value': {'stringValue': self._classify_email_content(subject)}},
+            {'name': 'email_participants', 'value': {'stringListValue': self._get_all_participants(fields)}},
+            {'name': 'email_domain_context', 'value': {'stringValue': self._extract_domain_context(sender_email)}},
+            {'name': 'email_time_period', 'value': {'stringValue': self._get_time_period(fields['datetime_sent'], now)}},
             
             # Standard Exchange fields
-            {'name': 'xchng_bccRecipient', 'value': {'stringListValue': self.get_email_addresses_list(getattr(email, 'bcc_recipients', []))}},
-            {'name': 'xchng_ccRecipient', 'value': {'stringListValue': self.get_email_addresses_list(getattr(email, 'cc_recipients', []))}},
+            {'name': 'xchng_bccRecipient', 'value': {'stringListValue': fields['bcc_emails']}},
+            {'name': 'xchng_ccRecipient', 'value': {'stringListValue': fields['cc_emails']}},
             {'name': 'xchng_hasAttachment', 'value': {'stringValue': str(has_attachments).lower()}},
-            {'name': 'xchng_sendDateTime', 'value': {'dateValue': self.format_datetime(getattr(email, 'datetime_sent', None))}},
-            {'name': 'xchng_importance', 'value': {'stringValue': self.clean_string(getattr(email, 'importance', ''))}},
+            {'name': 'xchng_sendDateTime', 'value': {'dateValue': fields['sent_date']}},
+            {'name': 'xchng_importance', 'value': {'stringValue': self.clean_string(fields['importance'])}},
             {'name': 'xchng_from', 'value': {'stringValue': self.clean_string(sender_email)}},
-            {'name': 'xchng_to', 'value': {'stringListValue': self.get_email_addresses_list(getattr(email, 'to_recipients', []))}},
+            {'name': 'xchng_to', 'value': {'stringListValue': fields['to_emails']}},
             {'name': 'xchng_receivedDateTime', 'value': {'dateValue': self.format_datetime(getattr(email, 'datetime_received', None))}},
             {'name': 'xchng_isRead', 'value': {'stringValue': str(is_read).lower()}},
             {'name': 'xchng_replyTo', 'value': {'stringValue': self.clean_string(getattr(email, 'reply_to', ''))}},
@@ -564,188 +718,214 @@ Content:
         
         return attributes
     
-    def _extract_thread_topic(self, email) -> str:
+    def _extract_thread_topic(self, subject: str) -> str:
         """Extract clean thread topic for conversation grouping"""
-        subject = getattr(email, 'subject', '') or ''
-        clean_topic = re.sub(r'^(RE:|FW:|FWD:)\s*', '', subject, flags=re.IGNORECASE).strip()
+        clean_topic = _strip_reply_prefix(subject)
         return self.clean_string(clean_topic)
     
-    def _get_email_priority(self, email) -> str:
+    def _get_email_priority(self, importance) -> str:
         """Determine email priority/importance"""
-        importance = getattr(email, 'importance', '')
         if importance:
             return str(importance).lower()
         return 'normal'
     
-    def _classify_email_content(self, email) -> str:
+    def _classify_email_content(self, subject: str) -> str:
         """Classify email content type for better categorization"""
-        subject = getattr(email, 'subject', '').lower()
-        
-        # Meeting/Calendar related
-        if any(word in subject for word in ['meeting', 'calendar', 'appointment', 'schedule']):
-            return 'meeting'
-        
-        # Project/Task related
-        if any(word in subject for word in ['project', 'task', 'deadline', 'deliverable']):
-            return 'project'
-        
-        # Document/Report related
-        if any(word in subject for word in ['report', 'document', 'analysis', 'review']):
-            return 'document'
-        
-        # Notification/Alert
-        if any(word in subject for word in ['notification', 'alert', 'reminder', 'update']):
-            return 'notification'
-        
-        return 'general'
+        # One case-insensitive scan finds every keyword; keep the highest priority category
+        best_category, best_rank = 'general', len(_CONTENT_CATEGORY_PRIORITY)
+        for match in _RE_CONTENT_CATEGORY.finditer(subject):
+            rank = _CONTENT_CATEGORY_PRIORITY[match.lastgroup]
+            if rank < best_rank:
+                if rank == 0:
+                    return match.lastgroup
+                best_category, best_rank = match.lastgroup, rank
+        
+        return best_category
     
-    def _get_all_participants(self, email) -> List[str]:
+    def _get_all_participants(self, fields: Dict[str, Any]) -> List[str]:
         """Get all email participants for relationship mapping"""
-        participants = []
-        
-        # Add sender
-        if hasattr(email, 'sender') and email.sender:
-            participants.append(getattr(email.sender, 'email_address', ''))
-        
-        # Add all recipients
-        for recipient_list in ['to_recipients', 'cc_recipients', 'bcc_recipients']:
-            if hasattr(email, recipient_list):
-                recipients = getattr(email, recipient_list) or []
-                participants.extend([getattr(r, 'email_address', '') for r in recipients if r and hasattr(r, 'email_address')])
-        
-        return list(set(filter(None, participants)))
+        # Reuse the recipient addresses already extracted for the xchng_* attributes;
+        # dict.fromkeys deduplicates in one pass and keeps sender-first order
+        participants = chain((fields['sender_email'],), fields['to_emails'], fields['cc_emails'], fields['bcc_emails'])
+        return list(dict.fromkeys(address for address in participants if address))
     
-    def _extract_domain_context(self, email) -> str:
+    def _extract_domain_context(self, sender_email: str) -> str:
         """Extract domain/organization context"""
-        if hasattr(email, 'sender') and email.sender:
-            sender_email = getattr(email.sender, 'email_address', '')
-            if '@' in sender_email:
-                domain = sender_email.split('@')[1].lower()
-                return domain
+        if sender_email and '@' in sender_email:
+            domain = sender_email.split('@')[1].lower()
+            return domain
         return ''
     
-    def _get_time_period(self, email) -> str:
+    def _get_time_period(self, sent_date, now: datetime = None) -> str:
         """Categorize email by time period for temporal queries"""
-        sent_date = getattr(email, 'datetime_sent', None)
         if not sent_date:
             return 'unknown'
         
-        now = datetime.now(timezone.utc)
-        if hasattr(sent_date, 'replace'):
-            if sent_date.tzinfo is None:
-                sent_date = sent_date.replace(tzinfo=timezone.utc)
-        
-        days_ago = (now - sent_date).days
-        
-        if days_ago <= 1:
-            return 'today'
-        elif days_ago <= 7:
-            return 'this_week'
-        elif days_ago <= 30:
-            return 'this_month'
-        elif days_ago <= 90:
-            return 'last_3_months'
-        elif days_ago <= 365:
-            return 'this_year'
-        else:
-            return 'older'
+        if now is None:
+            now = datetime.now(timezone.utc)
+        if isinstance(sent_date, str):
+            try:
+                sent_date = _parse_iso_datetime(sent_date)
+            except ValueError:
+                return 'unknown'
+        if sent_date.tzinfo is None:
+            sent_date = sent_date.replace(tzinfo=timezone.utc)
+        
+        # Compare against cut-off timestamps computed once per reference time;
+        # (now - sent_date).days <= N is the same as sent_date > now - (N + 1) days
+        bounds_now, bounds = self._time_period_bounds
+        if bounds_now != now:
+            bounds = tuple((now - timedelta(days=max_days + 1), label) for max_days, label in _TIME_PERIODS)
+            self._time_period_bounds = (now, bounds)
+        
+        for cutoff, label in bounds:
+            if sent_date > cutoff:
+                return label
+        return 'older'
     
     def _improve_content_quality(self, content: str) -> str:
         """Improve content quality for better Q Business understanding"""
         
-        # Remove excessive whitespace but preserve structure
-        content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
-        content = re.sub(r'[ \t]+', ' ', content)
+        # Remove email signatures first so the passes below scan less text;
+        # none of them can change where a signature starts
+        if '--' in content:
+            content = _RE_SIGNATURE.sub('', content)
+        
+        # Remove excessive whitespace but preserve structure; single spaces are
+        # already clean, so skip the pass unless there is a tab or a double space
+        content = _RE_BLANK_LINES.sub('\n\n', content)
+        if '\t' in content or '  ' in content:
+            content = _RE_HORIZONTAL_WHITESPACE.sub(' ', content)
         
         # Fix common formatting issues
-        content = re.sub(r'([.!?])\s*([A-Z])', r'\1 \2', content)
-        content = re.sub(r'([a-z])([A-Z])', r'\1 \2', content)
+        content = _RE_SENTENCE_BREAK.sub(r'\1 \2', content)
+        content = _RE_CAMEL_CASE_JOIN.sub(r'\1 \2', content)
         
-        # Remove email signatures and disclaimers
-        content = re.sub(r'\n\s*--+\s*\n.*', '', content, flags=re.DOTALL)
-        content = re.sub(r'\n\s*This email.*confidential.*', '', content, flags=re.DOTALL | re.IGNORECASE)
+        # Remove disclaimers last: the whitespace and sentence fixes decide whether one still matches
+        content = _RE_DISCLAIMER.sub('', content)
         
         return content.strip()   
  
-    def create_qbusiness_document(self, email_item, folder_name: str, folder, account_email: str = None) -> Optional[Dict[str, Any]]:
+    def _get_access_control_list(self, account_email: str) -> List[Dict]:
+        """Get the account owner's ACL, built once per account and shared by all of its documents"""
+        if not account_email:
+            return []
+        access_control_list = self._acl_cache.get(account_email)
+        if access_control_list is None:
+            access_control_list = [
+                {
+                    'memberRelation': 'OR',
+                    'principals': [
+                        {
+                            'user': {
+                                'id': account_email,
+                                'access': 'ALLOW'
+                            }
+                        }
+                    ]
+                }
+            ]
+            self._acl_cache[account_email] = access_control_list
+        return access_control_list
+    
+    def create_qbusiness_document(self, email_item, folder_name: str, folder, account_email: str = None, now: datetime = None) -> Optional[Dict[str, Any]]:
         """Create an enhanced Q Business document from an email item with better structure and metadata"""
         try:
             full_email = folder.get(id=email_item.id)
-            
-            # Get email body content
-            body_content = self._get_email_body_content(full_email)
-            
-            # Process attachments
-            attachment_content = self._process_email_attachments(full_email)
-            
-            # Create structured content
-            structured_content = self._create_structured_email_content(full_email, body_content, attachment_content, folder_name, account_email)
-            
-            # Create enhanced title
-            enhanced_title = self._create_enhanced_title(full_email, folder_name)
-            
-            # Improve content quality
-            structured_content = self._improve_content_quality(structured_content)
-
-            # Check content size limit (50MB for Q Business)
-            content_bytes = structured_content.encode('utf-8')
-            content_byte_size = len(content_bytes)
-            
-            if content_byte_size > 50000000:
-                print(f"Warning: Content too large ({content_byte_size} bytes), truncating...")
-                max_chars = int(50000000 * 0.8)
-                structured_content = structured_content[:max_chars] + "\n[Content truncated due to size limit]"
-            
-            content_type = 'PLAIN_TEXT'
-            
-            # Convert content to base64 blob
-            content_bytes = structured_content.encode('utf-8')
-            content_blob = base64.b64encode(content_bytes).decode('utf-8')
-
-            # Create ACL
-            access_control_list = []
-            if account_email:
-                access_control_list = [
-                    {
-                        'memberRelation': 'OR',
-                        'principals': [
-                            {
-                                'user': {
-                                    'id': account_email,
-                                    'access': 'ALLOW'
-                                }
-                            }
-                        ]
-                    }
-                ]
-
-            # Create enhanced attributes
-            enhanced_attributes = self._create_enhanced_attributes(full_email, folder_name, account_email)
-
-            document = {
-                'id': str(full_email.id),
-                'title': enhanced_title,
-                'content': {
-                    'blob': content_blob
-                },
-                'contentType': content_type,
-                'accessConfiguration': {
-                    'accessControls': access_control_list
-                },
-                'attributes': enhanced_attributes
-            }
-            
-            if not document.get('id'):
-                raise ValueError("Document ID is required")
-            if not document.get('title'):
-                raise ValueError("Document title is required")
-            if not document.get('content', {}).get('blob'):
-                raise ValueError("Document content is required")
-                
-            print(f"Created enhanced document: ID={document['id'][:50]}..., Size={len(content_bytes)} bytes")
-            
-            return document
-            
+            return self._build_qbusiness_document(full_email, folder_name, account_email, now)
         except Exception as e:
             print(f"Error creating document for email {email_item.id}: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def create_qbusiness_documents_bulk(self, email_items: List, folder_name: str, folder, account_email: str = None, now: datetime = None) -> List[Optional[Dict[str, Any]]]:
+        """Create Q Business documents for several email items, fetching the full emails in one EWS request"""
+        email_items = list(email_items)
+        try:
+            # GetItem for the whole batch in one round-trip; results come back in request order,
+            # with an exception instance in place of any item that could not be fetched
+            full_emails = list(folder.account.fetch(ids=email_items, folder=folder))
+        except Exception as e:
+            print(f"Error fetching {len(email_items)} emails in bulk, falling back to one request per email: {e}")
+            return [self.create_qbusiness_document(email_item, folder_name, folder, account_email, now) for email_item in email_items]
+        
+        documents = []
+        for email_item, full_email in zip(email_items, full_emails):
+            try:
+                if isinstance(full_email, Exception):
+                    raise full_email
+                documents.append(self._build_qbusiness_document(full_email, folder_name, account_email, now))
+            except Exception as e:
+                print(f"Error creating document for email {email_item.id}: {e}")
+                documents.append(None)
+        return documents
+    
+    def _build_qbusiness_document(self, full_email, folder_name: str, account_email: str = None, now: datetime = None) -> Dict[str, Any]:
+        """Build the Q Business document for a fully loaded email; raises if the document is invalid"""
+        # Get email body content
+        body_content = self._get_email_body_content(full_email)
+        
+        # Process attachments
+        attachment_content = self._process_email_attachments(full_email)
+        
+        # Read the header fields shared by content, title and attributes once
+        email_fields = self._snapshot_email_fields(full_email)
+        
+        # Create structured content
+        structured_content = self._create_structured_email_content(email_fields, body_content, attachment_content, folder_name, account_email)
+        
+        # Create enhanced title
+        enhanced_title = self._create_enhanced_title(email_fields, folder_name)
+        
+        # Improve content quality
+        structured_content = self._improve_content_quality(structured_content)
+
+        # Check content size limit (50MB for Q Business)
+        content_bytes = structured_content.encode('utf-8')
+        content_byte_size = len(content_bytes)
+        
+        if content_byte_size > 50000000:
+            print(f"Warning: Content too large ({content_byte_size} bytes), truncating...")
+            # Cut the encoded bytes directly, backing up to the start of a UTF-8 character
+            cut = int(50000000 * 0.8)
+            while cut and (content_bytes[cut] & 0xC0) == 0x80:
+                cut -= 1
+            content_bytes = content_bytes[:cut] + b"\n[Content truncated due to size limit]"
+        
+        # The encoded bytes are all that is needed from here on
+        del structured_content
+        
+        content_type = 'PLAIN_TEXT'
+        
+        # Convert content to base64 blob; botocore serializes a bytes blob exactly as it
+        # would the equivalent str, so the encoded bytes are passed without decoding
+        content_blob = _b64encode(content_bytes)
+
+        # Create ACL
+        access_control_list = self._get_access_control_list(account_email)
+
+        # Create enhanced attributes
+        enhanced_attributes = self._create_enhanced_attributes(full_email, email_fields, folder_name, account_email, now)
+
+        document = {
+            'id': email_fields['id'],
+            'title': enhanced_title,
+            'content': {
+                'blob': content_blob
+            },
+            'contentType': content_type,
+            'accessConfiguration': {
+                'accessControls': access_control_list
+            },
+            'attributes': enhanced_attributes
+        }
+        
+        if not document.get('id'):
+            raise ValueError("Document ID is required")
+        if not document.get('title'):
+            raise ValueError("Document title is required")
+        if not document.get('content', {}).get('blob'):
+            raise ValueError("Document content is required")
+            
+        logger.debug("Created enhanced document: ID=%s..., Size=%d bytes", document['id'][:50], len(content_bytes))
+        
+        return document
\ No newline at end of file
@@ -3,23 +3,79 @@ DynamoDB Client Module
 Handles DynamoDB operations for tracking processed emails
 """
 
-import boto3
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List, Set
+from typing import Dict, Any, Optional, List, Set, Iterator
+from boto3.dynamodb.table import BatchWriter
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
+from .config import get_boto3_session
 from .security_utils import sanitize_for_logging, handle_error_securely
 
 logger = logging.getLogger(__name__)
 
+# Keep pooled HTTPS connections alive across the many small per-email requests,
+# with enough of them for the worker threads, and back off adaptively when throttled
+DYNAMODB_BOTO_CONFIG = BotoConfig(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'max_attempts': 10, 'mode': 'adaptive'}
+)
+
+# How long a formatted processed_at timestamp is reused for a burst of writes
+PROCESSED_AT_REFRESH_SECONDS = 0.5
+
+# Number of segments (and threads) used for full-table parallel scans
+PARALLEL_SCAN_SEGMENTS = 8
+
+# Concurrent UpdateItem calls used for bulk-marked records that may already exist
+BULK_UPDATE_WORKERS = 8
+
+# Concurrent BatchWriteItem calls, of up to 25 deletes each, used when clearing an account
+BULK_DELETE_WORKERS = 8
+BATCH_WRITE_SIZE = 25
+
+# How long a DescribeTable response for an active table is reused by the structure/readiness checks
+DESCRIBE_TABLE_CACHE_SECONDS = 300
+
+# Process-wide DynamoDB resource and loaded tables, shared by every client instance
+# so that only the first one pays for the connection setup and DescribeTable call
+_dynamodb_resource = None
+_table_cache: Dict[str, Any] = {}
+_cache_lock = threading.Lock()
+
+def get_dynamodb_resource():
+    """Get the process-wide DynamoDB resource, creating it on first use"""
+    global _dynamodb_resource
+    with _cache_lock:
+        if _dynamodb_resource is None:
+            _dynamodb_resource = get_boto3_session().resource('dynamodb', config=DYNAMODB_BOTO_CONFIG)
+        return _dynamodb_resource
+
 class DynamoDBClient:
     """DynamoDB client for tracking processed emails"""
     
     def __init__(self, config):
         self.config = config
-        self.dynamodb = boto3.resource('dynamodb')
+        # The resource is created on first DynamoDB call, see the dynamodb property
+        self._dynamodb = None
         self.table = self._initialize_table()
+        # (account_email, folder_path) -> email IDs known to be processed, filled by prime_folder_cache
+        self._folder_cache: Dict[tuple, Set[str]] = {}
+        # (monotonic time, ISO timestamp) of the last processed_at value handed out
+        self._processed_at = (float('-inf'), '')
+        # (monotonic time, DescribeTable response) of the last description of an active table
+        self._describe_cache: Optional[tuple] = None
+    
+    @property
+    def dynamodb(self):
+        """DynamoDB resource, created on first use"""
+        if self._dynamodb is None:
+            self._dynamodb = get_dynamodb_resource()
+        return self._dynamodb
     
     def _initialize_table(self):
         """Initialize DynamoDB table reference"""
@@ -29,12 +85,21 @@ class DynamoDBClient:
     
     def _ensure_table_exists(self):
         """Ensure table exists and is initialized"""
+        # Per-email methods check self.table themselves and only call this until it is set
         if self.table is None:
+            # Another instance in this process may already have loaded the table
+            table = _table_cache.get(self.config.table_name)
+            if table is not None:
+                self.table = table
+                return
             try:
                 table = self.dynamodb.Table(self.config.table_name)
                 table.load()
                 print(f"Using existing DynamoDB table: {self.config.table_name}")
                 self.table = table
+                # load() is itself a DescribeTable call; keep its result for the table checks
+                if table.meta.data and table.meta.data.get('TableStatus') == 'ACTIVE':
+                    self._describe_cache = (time.monotonic(), {'Table': table.meta.data})
             except ClientError as e:
                 error_code = e.response['Error']['Code']
                 if error_code == 'ResourceNotFoundException':
@@ -43,6 +108,8 @@ class DynamoDBClient:
                 else:
                     error_msg = handle_error_securely(e, f"accessing DynamoDB table '{self.config.table_name}'")
                     raise Exception(error_msg)
+            with _cache_lock:
+                _table_cache[self.config.table_name] = self.table
     
     def _create_table(self):
         """Create DynamoDB table with required structure"""
@@ -110,29 +177,66 @@ class DynamoDBClient:
         except Exception as e:
             raise Exception(f"Unexpected error creating DynamoDB table '{self.config.table_name}': {e}")
     
+    def _processed_at_timestamp(self) -> str:
+        """Current UTC time in ISO format, shared by writes made within PROCESSED_AT_REFRESH_SECONDS"""
+        now_monotonic = time.monotonic()
+        cached_at, timestamp = self._processed_at
+        if now_monotonic - cached_at >= PROCESSED_AT_REFRESH_SECONDS:
+            timestamp = datetime.now(timezone.utc).isoformat()
+            self._processed_at = (now_monotonic, timestamp)
+        return timestamp
+    
     def _create_folder_email_key(self, folder_path: str, email_id: str) -> str:
         """Create sort key from folder_path and email_id"""
         return f"{folder_path}#{email_id}"
     
+    def _create_item_key(self, account_email: str, folder_path: str, email_id: str) -> Dict[str, str]:
+        """Create the table key for an email, building the sort key inline"""
+        return {
+            'account_email': account_email,
+            'folder_email_key': f"{folder_path}#{email_id}"
+        }
+    
     def _extract_email_id_from_folder_email_key(self, folder_email_key: str) -> str:
         """Extract email_id from folder_email_key"""
-        parts = folder_email_key.split('#')
-        return parts[-1] if len(parts) >= 2 else ''
+        _, separator, email_id = folder_email_key.rpartition('#')
+        return email_id if separator else ''
     
     def _extract_folder_from_folder_email_key(self, folder_email_key: str) -> str:
         """Extract folder_path from folder_email_key"""
-        parts = folder_email_key.split('#')
-        return parts[0] if len(parts) >= 2 else ''
+        folder_path, separator, _ = folder_email_key.partition('#')
+        return folder_path if separator else ''
+    
+    def prime_folder_cache(self, folder_name: str, account_email: str) -> Set[str]:
+        """Load a folder's processed email IDs with one paginated query and cache them for is_email_processed"""
+        try:
+            processed_ids = set(self.iter_processed_email_ids_for_folder(folder_name, account_email))
+        except ClientError as e:
+            error_msg = handle_error_securely(e, f"querying DynamoDB table for folder {sanitize_for_logging(folder_name)}")
+            logger.error(error_msg)
+            # Leave the folder uncached: an empty set here would make every record look new to
+            # mark_emails_processed_bulk, which would then overwrite existing records' attempt history
+            return set()
+        self._folder_cache[(account_email, folder_name)] = processed_ids
+        return processed_ids
+    
+    def release_folder_cache(self, folder_name: str, account_email: str) -> None:
+        """Drop a folder's cached processed email IDs once the folder has been processed"""
+        self._folder_cache.pop((account_email, folder_name), None)
     
     def is_email_processed(self, email_id: str, account_email: str, folder_path: str) -> bool:
         """Check if email ID has been processed"""
+        email_id_str = email_id if isinstance(email_id, str) else str(email_id)
+        # Answer from the primed folder cache; only a miss costs a GetItem round-trip
+        cached_ids = self._folder_cache.get((account_email, folder_path))
+        if cached_ids is not None and email_id_str in cached_ids:
+            return True
+        
         try:
-            self._ensure_table_exists()
-            folder_email_key = self._create_folder_email_key(folder_path, email_id)
-            response = self.table.get_item(Key={
-                'account_email': account_email,
-                'folder_email_key': folder_email_key
-            })
+            if self.table is None:
+                self._ensure_table_exists()
+            response = self.table.meta.client.get_item(TableName=self.config.table_name,
+                                                       Key=self._create_item_key(account_email, folder_path, email_id_str))
             return 'Item' in response
         except ClientError:
             return False
@@ -140,12 +244,11 @@ class DynamoDBClient:
     def get_email_processing_info(self, email_id: str, account_email: str, folder_path: str) -> dict:
         """Get processing information for an email"""
         try:
-            self._ensure_table_exists()
-            folder_email_key = self._create_folder_email_key(folder_path, email_id)
-            response = self.table.get_item(Key={
-                'account_email': account_email,
-                'folder_email_key': folder_email_key
-            })
+            if self.table is None:
+                self._ensure_table_exists()
+            email_id_str = email_id if isinstance(email_id, str) else str(email_id)
+            response = self.table.meta.client.get_item(TableName=self.config.table_name,
+                                                       Key=self._create_item_key(account_email, folder_path, email_id_str))
             return response.get('Item', {})
         except ClientError:
             return {}
@@ -154,22 +257,22 @@ class DynamoDBClient:
                            status: str = 'processed', account_email: str = None) -> bool:
         """Mark email ID as processed or failed - updates existing item if it exists"""
         try:
-            self._ensure_table_exists()
-            email_id_str = str(email_id)
-            current_time = datetime.now(timezone.utc).isoformat()
+            if self.table is None:
+                self._ensure_table_exists()
+            email_id_str = email_id if isinstance(email_id, str) else str(email_id)
+            current_time = self._processed_at_timestamp()
             
             if not account_email:
                 raise ValueError("account_email is required")
             
-            # Create folder_email_key
-            folder_email_key = self._create_folder_email_key(folder_name, email_id_str)
+            # The written item is only read back for the debug log, and then only its attempt_count
+            log_attempt = logger.isEnabledFor(logging.DEBUG)
             
-            # Use update_item to handle both new items and updates to existing items
-            response = self.table.update_item(
-                Key={
-                    'account_email': account_email,
-                    'folder_email_key': folder_email_key
-                },
+            # Use update_item to handle both new items and updates to existing items; go through
+            # the thread-safe client so mark_emails_processed_bulk can call this from a pool
+            response = self.table.meta.client.update_item(
+                TableName=self.config.table_name,
+                Key=self._create_item_key(account_email, folder_name, email_id_str),
                 UpdateExpression='SET datetime_created = :created, processed_at = :processed, #status = :status, attempt_count = if_not_exists(attempt_count, :zero) + :one',
                 ExpressionAttributeNames={
                     '#status': 'status'  # 'status' is a reserved word in DynamoDB
@@ -181,17 +284,22 @@ class DynamoDBClient:
                     ':zero': 0,
                     ':one': 1
                 },
-                ReturnValues='ALL_NEW'
+                ReturnValues='UPDATED_NEW' if log_attempt else 'NONE'
             )
             
-            # Log the update
-            updated_item = response.get('Attributes', {})
-            attempt_count = updated_item.get('attempt_count', 1)
+            # Keep a primed folder cache in step with the table
+            cached_ids = self._folder_cache.get((account_email, folder_name))
+            if cached_ids is not None:
+                cached_ids.add(email_id_str)
             
-            if attempt_count == 1:
-                print(f"  DynamoDB: Created new record for email {email_id_str[:20]}... with status '{status}'")
-            else:
-                print(f"  DynamoDB: Updated existing record for email {email_id_str[:20]}... with status '{status}' (attempt #{attempt_count})")
+            # Log the update
+            if log_attempt:
+                attempt_count = response.get('Attributes', {}).get('attempt_count', 1)
+                if attempt_count == 1:
+                    logger.debug("DynamoDB: Created new record for email %s... with status '%s'", email_id_str[:20], status)
+                else:
+                    logger.debug("DynamoDB: Updated existing record for email %s... with status '%s' (attempt #%s)",
+                                 email_id_str[:20], status, attempt_count)
             
             return True
             
@@ -200,71 +308,146 @@ class DynamoDBClient:
             logger.error(error_msg)
             return False
     
-    def get_processed_email_ids_for_folder(self, folder_name: str, account_email: str) -> Set[str]:
-        """Get email IDs from DynamoDB that have been processed for a specific folder"""
+    def mark_emails_processed_bulk(self, records: List[Dict[str, Any]]) -> bool:
+        """Mark many emails at once, batch-writing records that are new and updating the rest in place"""
+        if not records:
+            return True
         try:
             self._ensure_table_exists()
-            processed_ids = set()
-            
-            # Create prefix for folder_email_key: folder_name#
-            folder_prefix = f"{folder_name}#"
+            current_time = self._processed_at_timestamp()
+            
+            # A record is known to be new only if its folder cache is primed and does not hold it;
+            # anything else goes through mark_email_processed to keep the attempt_count increment
+            new_records = []
+            existing_records = []
+            for record in records:
+                if not record.get('account_email'):
+                    raise ValueError("account_email is required")
+                email_id = record['email_id']
+                email_id_str = email_id if isinstance(email_id, str) else str(email_id)
+                cached_ids = self._folder_cache.get((record['account_email'], record['folder_name']))
+                if cached_ids is not None and email_id_str not in cached_ids:
+                    new_records.append((record, email_id_str))
+                else:
+                    existing_records.append(record)
+            
+            if new_records:
+                # batch_writer sends 25 items per BatchWriteItem and resends unprocessed items
+                with self._batch_writer() as batch_writer:
+                    for record, email_id_str in new_records:
+                        batch_writer.put_item(Item={
+                            'account_email': record['account_email'],
+                            'folder_email_key': self._create_folder_email_key(record['folder_name'], email_id_str),
+                            'datetime_created': str(record['datetime_created']),
+                            'processed_at': current_time,
+                            'status': record['status'],
+                            'attempt_count': 1
+                        })
+                for record, email_id_str in new_records:
+                    cached_ids = self._folder_cache.get((record['account_email'], record['folder_name']))
+                    if cached_ids is not None:
+                        cached_ids.add(email_id_str)
+                logger.debug("DynamoDB: batch-created %d new records", len(new_records))
+            
+            if not existing_records:
+                return True
             
-            # Use efficient query with begins_with on sort key
-            response = self.table.query(
-                KeyConditionExpression='account_email = :account AND begins_with(folder_email_key, :folder_prefix)',
-                ExpressionAttributeValues={
-                    ':account': account_email,
-                    ':folder_prefix': folder_prefix
-                }
-            )
+            # These need UpdateItem for the attempt_count increment, so pipeline them instead
+            with ThreadPoolExecutor(max_workers=min(BULK_UPDATE_WORKERS, len(existing_records))) as executor:
+                results = list(executor.map(
+                    lambda record: self.mark_email_processed(
+                        record['email_id'],
+                        record['folder_name'],
+                        record['datetime_created'],
+                        record['status'],
+                        record['account_email']
+                    ),
+                    existing_records
+                ))
+            return all(results)
             
+        except ClientError as e:
+            error_msg = handle_error_securely(e, "batch marking emails")
+            logger.error(error_msg)
+            return False
+    
+    def iter_processed_email_ids_for_folder(self, folder_name: str, account_email: str) -> Iterator[str]:
+        """Yield the processed email IDs of a folder page by page, without holding them all in memory"""
+        self._ensure_table_exists()
+        
+        # Create prefix for folder_email_key: folder_name#
+        folder_prefix = f"{folder_name}#"
+        
+        # Use efficient query with begins_with on sort key, reading only the sort key
+        query_kwargs = {
+            'KeyConditionExpression': 'account_email = :account AND begins_with(folder_email_key, :folder_prefix)',
+            'ExpressionAttributeValues': {
+                ':account': account_email,
+                ':folder_prefix': folder_prefix
+            },
+            'ProjectionExpression': 'folder_email_key'
+        }
+        
+        # The query only returns sort keys that start with the folder prefix, so
+        # the email ID is whatever follows it
+        prefix_length = len(folder_prefix)
+        table_query = self.table.meta.client.query
+        while True:
+            response = table_query(TableName=self.config.table_name, **query_kwargs)
             for item in response['Items']:
-                folder_email_key = item.get('folder_email_key', '')
-                email_id = self._extract_email_id_from_folder_email_key(folder_email_key)
+                email_id = item['folder_email_key'][prefix_length:]
                 if email_id:
-                    processed_ids.add(email_id)
-            
-            while 'LastEvaluatedKey' in response:
-                response = self.table.query(
-                    KeyConditionExpression='account_email = :account AND begins_with(folder_email_key, :folder_prefix)',
-                    ExpressionAttributeValues={
-                        ':account': account_email,
-                        ':folder_prefix': folder_prefix
-                    },
-                    ExclusiveStartKey=response['LastEvaluatedKey']
-                )
-                for item in response['Items']:
-                    folder_email_key = item.get('folder_email_key', '')
-                    email_id = self._extract_email_id_from_folder_email_key(folder_email_key)
-                    if email_id:
-                        processed_ids.add(email_id)
-            
-            return processed_ids
+                    yield email_id
+            if 'LastEvaluatedKey' not in response:
+                return
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    def get_processed_email_ids_for_folder(self, folder_name: str, account_email: str) -> Set[str]:
+        """Get email IDs from DynamoDB that have been processed for a specific folder"""
+        try:
+            return set(self.iter_processed_email_ids_for_folder(folder_name, account_email))
         except ClientError as e:
             error_msg = handle_error_securely(e, f"querying DynamoDB table for folder {sanitize_for_logging(folder_name)}")
             logger.error(error_msg)
             return set()
     
+    def _scan_segment(self, segment: int, total_segments: int, scan_kwargs: Dict[str, Any]) -> List[dict]:
+        """Read every page of one parallel-scan segment"""
+        # The resource's client is thread-safe, unlike the Table resource, and
+        # still returns deserialized attribute values
+        client_scan = self.table.meta.client.scan
+        scan_kwargs = dict(scan_kwargs, TableName=self.config.table_name,
+                           Segment=segment, TotalSegments=total_segments)
+        items = []
+        while True:
+            response = client_scan(**scan_kwargs)
+            items.extend(response['Items'])
+            if 'LastEvaluatedKey' not in response:
+                return items
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    def _parallel_scan(self, segments: int = PARALLEL_SCAN_SEGMENTS, **scan_kwargs) -> Iterator[dict]:
+        """Scan the table in parallel segments, yielding items segment by segment"""
+        # max_pool_connections in DYNAMODB_BOTO_CONFIG must be at least the segment count
+        with ThreadPoolExecutor(max_workers=segments) as executor:
+            futures = [executor.submit(self._scan_segment, segment, segments, scan_kwargs)
+                       for segment in range(segments)]
+            for future in futures:
+                yield from future.result()
+    
     def get_all_processed_email_ids(self) -> Set[str]:
         """Get all email IDs from DynamoDB that have been processed"""
         try:
             self._ensure_table_exists()
             processed_ids = set()
-            response = self.table.scan()
-            
-            for item in response['Items']:
-                folder_email_key = item.get('folder_email_key', '')
-                email_id = self._extract_email_id_from_folder_email_key(folder_email_key)
-                if email_id:
-                    processed_ids.add(email_id)
+            add_processed_id = processed_ids.add
             
-            while 'LastEvaluatedKey' in response:
-                response = self.table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-                for item in response['Items']:
-                    folder_email_key = item.get('folder_email_key', '')
-                    email_id = self._extract_email_id_from_folder_email_key(folder_email_key)
-                    if email_id:
-                        processed_ids.add(email_id)
+            # Only the sort key is needed to recover the email IDs
+            for item in self._parallel_scan(ProjectionExpression='folder_email_key'):
+                folder_email_key = item['folder_email_key']
+                separator_index = folder_email_key.rfind('#')
+                if separator_index != -1 and separator_index + 1 < len(folder_email_key):
+                    add_processed_id(folder_email_key[separator_index + 1:])
             
             return processed_ids
         except ClientError as e:
@@ -272,33 +455,31 @@ class DynamoDBClient:
             logger.error(error_msg)
             return set()
     
-    def get_processed_emails_by_account(self, account_email: str) -> List[Dict[str, Any]]:
-        """Get all processed emails for a specific account"""
+    def iter_processed_emails_by_account(self, account_email: str, projection: str = None) -> Iterator[Dict[str, Any]]:
+        """Yield the processed email records of an account page by page, optionally reading only the projected attributes"""
+        self._ensure_table_exists()
+        
+        # Use efficient query on partition key
+        query_kwargs = {
+            'KeyConditionExpression': 'account_email = :account',
+            'ExpressionAttributeValues': {
+                ':account': account_email
+            }
+        }
+        if projection:
+            query_kwargs['ProjectionExpression'] = projection
+        
+        while True:
+            response = self.table.meta.client.query(TableName=self.config.table_name, **query_kwargs)
+            yield from response['Items']
+            if 'LastEvaluatedKey' not in response:
+                return
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    def get_processed_emails_by_account(self, account_email: str, projection: str = None) -> List[Dict[str, Any]]:
+        """Get all processed emails for a specific account, optionally reading only the projected attributes"""
         try:
-            self._ensure_table_exists()
-            processed_emails = []
-            
-            # Use efficient query on partition key
-            response = self.table.query(
-                KeyConditionExpression='account_email = :account',
-                ExpressionAttributeValues={
-                    ':account': account_email
-                }
-            )
-            
-            processed_emails.extend(response['Items'])
-            
-            while 'LastEvaluatedKey' in response:
-                response = self.table.query(
-                    KeyConditionExpression='account_email = :account',
-                    ExpressionAttributeValues={
-                        ':account': account_email
-                    },
-                    ExclusiveStartKey=response['LastEvaluatedKey']
-                )
-                processed_emails.extend(response['Items'])
-            
-            return processed_emails
+            return list(self.iter_processed_emails_by_account(account_email, projection))
             
         except ClientError as e:
             print(f"Error querying DynamoDB table for account {account_email}: {e}")
@@ -307,25 +488,40 @@ class DynamoDBClient:
     def delete_email_record(self, email_id: str, account_email: str, folder_path: str) -> bool:
         """Delete an email ID from DynamoDB"""
         try:
-            self._ensure_table_exists()
-            folder_email_key = self._create_folder_email_key(folder_path, email_id)
-            self.table.delete_item(Key={
-                'account_email': account_email,
-                'folder_email_key': folder_email_key
-            })
+            if self.table is None:
+                self._ensure_table_exists()
+            email_id_str = email_id if isinstance(email_id, str) else str(email_id)
+            # The thread-safe client lets callers delete records from several threads
+            self.table.meta.client.delete_item(TableName=self.config.table_name,
+                                               Key=self._create_item_key(account_email, folder_path, email_id_str))
+            cached_ids = self._folder_cache.get((account_email, folder_path))
+            if cached_ids is not None:
+                cached_ids.discard(email_id_str)
             return True
         except ClientError as e:
             error_msg = handle_error_securely(e, f"deleting email {sanitize_for_logging(str(email_id))} from DynamoDB")
             logger.error(error_msg)
             return False
     
+    def _batch_writer(self) -> BatchWriter:
+        """Batch writer on the thread-safe client, so several threads can each run their own"""
+        # overwrite_by_pkeys drops duplicate keys so one request never carries the same key twice
+        return BatchWriter(self.config.table_name, self.table.meta.client,
+                           overwrite_by_pkeys=['account_email', 'folder_email_key'])
+    
+    def _delete_keys(self, keys: List[Dict[str, str]]):
+        """Delete a chunk of items through its own batch writer"""
+        with self._batch_writer() as batch_writer:
+            for key in keys:
+                batch_writer.delete_item(Key=key)
+    
     def clear_processed_emails_for_account(self, account_email: str) -> bool:
         """Clear all processed email records for an account (for full sync)"""
         try:
             self._ensure_table_exists()
             
-            # Get all processed emails for this account
-            processed_emails = self.get_processed_emails_by_account(account_email)
+            # Get the keys of all processed emails for this account
+            processed_emails = self.get_processed_emails_by_account(account_email, 'account_email, folder_email_key')
             
             if not processed_emails:
                 print(f"No processed emails found for account {account_email}")
@@ -333,21 +529,23 @@ class DynamoDBClient:
             
             print(f"Clearing {len(processed_emails)} processed email records for {account_email}")
             
-            # Delete in batches
-            batch_size = 25  # DynamoDB batch write limit
+            # Drop cached folder state for this account; it is about to be stale
+            for cache_key in [key for key in self._folder_cache if key[0] == account_email]:
+                del self._folder_cache[cache_key]
             
-            for i in range(0, len(processed_emails), batch_size):
-                batch = processed_emails[i:i + batch_size]
-                
-                with self.table.batch_writer() as batch_writer:
-                    for email in batch:
-                        account_email_key = email.get('account_email')
-                        folder_email_key = email.get('folder_email_key')
-                        if account_email_key and folder_email_key:
-                            batch_writer.delete_item(Key={
-                                'account_email': account_email_key,
-                                'folder_email_key': folder_email_key
-                            })
+            keys = [
+                {
+                    'account_email': email['account_email'],
+                    'folder_email_key': email['folder_email_key']
+                }
+                for email in processed_emails
+                if email.get('account_email') and email.get('folder_email_key')
+            ]
+            
+            # Send the independent BatchWriteItem requests concurrently, one chunk per request
+            with ThreadPoolExecutor(max_workers=BULK_DELETE_WORKERS) as executor:
+                list(executor.map(self._delete_keys,
+                                  (keys[i:i + BATCH_WRITE_SIZE] for i in range(0, len(keys), BATCH_WRITE_SIZE))))
             
             print(f"Cleared processed email records for {account_email}")
             return True
@@ -356,11 +554,23 @@ class DynamoDBClient:
             print(f"Error clearing processed emails for {account_email}: {e}")
             return False
     
+    def _describe_table(self) -> Dict[str, Any]:
+        """Describe the table, reusing a recent description of it once it is active"""
+        if self._describe_cache is not None:
+            described_at, table_description = self._describe_cache
+            if time.monotonic() - described_at < DESCRIBE_TABLE_CACHE_SECONDS:
+                return table_description
+        table_description = self.table.meta.client.describe_table(TableName=self.config.table_name)
+        # Only an active table's description is stable enough to reuse
+        if table_description.get('Table', {}).get('TableStatus') == 'ACTIVE':
+            self._describe_cache = (time.monotonic(), table_description)
+        return table_description
+    
     def check_table_structure(self) -> bool:
         """Check if table has the required structure"""
         try:
             self._ensure_table_exists()
-            table_description = self.table.meta.client.describe_table(TableName=self.config.table_name)
+            table_description = self._describe_table()
             
             # Check primary key structure
             key_schema = table_description.get('Table', {}).get('KeySchema', [])
@@ -386,7 +596,7 @@ class DynamoDBClient:
             self._ensure_table_exists()
             
             # Check table status
-            table_description = self.table.meta.client.describe_table(TableName=self.config.table_name)
+            table_description = self._describe_table()
             table_status = table_description.get('Table', {}).get('TableStatus', 'UNKNOWN')
             
             if table_status != 'ACTIVE':
@@ -17,6 +17,15 @@ from .qbusiness_client import QBusinessClient
 
 logger = logging.getLogger(__name__)
 
+# Folder display-name prefixes stripped in order: (prefix with separator, bare name, replacement)
+FOLDER_PATH_PREFIXES = (
+    ("Top of Information Store/", "Top of Information Store", "Root"),
+    ("Root/", "Root", ""),
+)
+
+# Failed email IDs shown in the per-batch marking summary
+FAILED_EMAIL_SAMPLES = 5
+
 class EmailProcessor:
     """Main email processor that coordinates the workflow"""
     
@@ -47,18 +56,27 @@ class EmailProcessor:
         with self._counter_lock:
             self.emails_attempted_count += count
     
+    def _try_count_attempt(self) -> bool:
+        """Thread-safe check-and-increment of attempted emails count; False once the testing limit is reached"""
+        with self._counter_lock:
+            if self.config.testing_email_limit is not None and self.emails_attempted_count >= self.config.testing_email_limit:
+                return False
+            self.emails_attempted_count += 1
+            return True
+    
     def _increment_processed_count(self, count: int = 1):
         """Thread-safe increment of processed emails count"""
         with self._counter_lock:
             self.emails_processed_count += count
     
-    def _update_account_stats(self, account_email: str, status: str):
+    def _update_account_stats(self, account_email: str, status: str, count: int = 1):
         """Update statistics for an account"""
-        if account_email not in self.account_stats:
-            self.account_stats[account_email] = {'processed': 0, 'failed': 0, 'total': 0}
+        stats = self.account_stats.get(account_email)
+        if stats is None:
+            stats = self.account_stats[account_email] = {'processed': 0, 'failed': 0, 'total': 0}
         
-        self.account_stats[account_email][status] = self.account_stats[account_email].get(status, 0) + 1
-        self.account_stats[account_email]['total'] += 1
+        stats[status] = stats.get(status, 0) + count
+        stats['total'] += count
     
 
     
@@ -68,39 +86,49 @@ class EmailProcessor:
             return True
             
         try:
-            print(f"🗑️  Deleting {len(email_ids)} documents from Q Business and DynamoDB ({reason})...")
-            
-            # Delete from Q Business first
-            qbusiness_success = self.qbusiness_client.batch_delete_documents(email_ids)
-            if not qbusiness_success:
-                print(f"⚠️  Some Q Business document deletions failed for {reason}")
+            logger.info("🗑️  Deleting %d documents from Q Business and DynamoDB (%s)...", len(email_ids), reason)
             
-            # Delete from DynamoDB
-            dynamodb_deleted_count = 0
-            for email_id in email_ids:
+            # Q Business and DynamoDB are independent, so delete from both at once and
+            # spread the per-record DynamoDB deletes over the worker threads
+            with ThreadPoolExecutor(max_workers=self.config.max_worker_threads + 1) as executor:
+                qbusiness_future = executor.submit(self.qbusiness_client.batch_delete_documents, email_ids)
+                
                 if account_email and folder_name:
                     # Use the proper delete method with composite key
-                    if self.dynamodb_client.delete_email_record(email_id, account_email, folder_name):
-                        dynamodb_deleted_count += 1
+                    delete_results = executor.map(
+                        lambda email_id: self.dynamodb_client.delete_email_record(email_id, account_email, folder_name),
+                        email_ids
+                    )
                 else:
                     # Fallback: try to delete by scanning for the email_id (less efficient)
-                    if self._delete_email_record_by_scan(email_id):
-                        dynamodb_deleted_count += 1
+                    delete_results = executor.map(self._delete_email_record_by_scan, email_ids)
+                dynamodb_deleted_count = sum(1 for deleted in delete_results if deleted)
+                
+                qbusiness_success = qbusiness_future.result()
+            
+            if not qbusiness_success:
+                logger.warning("⚠️  Some Q Business document deletions failed for %s", reason)
             
-            print(f"✅ Deleted {len(email_ids)} documents from Q Business and {dynamodb_deleted_count} records from DynamoDB ({reason})")
+            logger.info("✅ Deleted %d documents from Q Business and %d records from DynamoDB (%s)", len(email_ids), dynamodb_deleted_count, reason)
             return qbusiness_success and dynamodb_deleted_count == len(email_ids)
             
         except Exception as e:
-            print(f"❌ Error deleting documents and records ({reason}): {e}")
+            logger.error("❌ Error deleting documents and records (%s): %s", reason, e)
             return False
     
     def _delete_email_record_by_scan(self, email_id: str) -> bool:
         """Fallback method to delete email record by scanning for it (less efficient)"""
         try:
-            # We need to scan the table to find the keys
-            response = self.dynamodb_client.table.scan(
+            # We need to scan the table to find the keys; use the table's thread-safe
+            # client since deletions run on several threads at once
+            client = self.dynamodb_client.table.meta.client
+            table_name = self.config.table_name
+            response = client.scan(
+                TableName=table_name,
                 FilterExpression='contains(folder_email_key, :email_id)',
-                ExpressionAttributeValues={':email_id': f"#{email_id}"}
+                ExpressionAttributeValues={':email_id': f"#{email_id}"},
+                # Only the key attributes are needed to delete the record
+                ProjectionExpression='account_email, folder_email_key'
             )
             
             for item in response['Items']:
@@ -108,7 +136,7 @@ class EmailProcessor:
                 account_email = item.get('account_email', '')
                 if folder_email_key.endswith(f"#{email_id}") and account_email:
                     # Found the record, delete it
-                    self.dynamodb_client.table.delete_item(Key={
+                    client.delete_item(TableName=table_name, Key={
                         'account_email': account_email,
                         'folder_email_key': folder_email_key
                     })
@@ -116,9 +144,11 @@ class EmailProcessor:
                     
             # Handle pagination
             while 'LastEvaluatedKey' in response:
-                response = self.dynamodb_client.table.scan(
+                response = client.scan(
+                    TableName=table_name,
                     FilterExpression='contains(folder_email_key, :email_id)',
                     ExpressionAttributeValues={':email_id': f"#{email_id}"},
+                    ProjectionExpression='account_email, folder_email_key',
                     ExclusiveStartKey=response['LastEvaluatedKey']
                 )
                 
@@ -127,7 +157,7 @@ class EmailProcessor:
                     account_email = item.get('account_email', '')
                     if folder_email_key.endswith(f"#{email_id}") and account_email:
                         # Found the record, delete it
-                        self.dynamodb_client.table.delete_item(Key={
+                        client.delete_item(TableName=table_name, Key={
                             'account_email': account_email,
                             'folder_email_key': folder_email_key
                         })
@@ -135,7 +165,7 @@ class EmailProcessor:
             
             return False
         except Exception as e:
-            print(f"❌ Error in fallback delete for email {email_id}: {e}")
+            logger.error("❌ Error in fallback delete for email %s: %s", email_id, e)
             return False
     
     def _submit_document_batch(self, documents: list, documents_to_delete: list, emails_to_mark: list, sync_job_id: str = None) -> bool:
@@ -146,48 +176,48 @@ class EmailProcessor:
         try:
             batch_size = len(documents) + len(documents_to_delete)
             if batch_size == 0:
-                # Still mark emails as processed even if no documents to submit
+                # Still mark emails as processed even if no documents to submit; the finally
+                # block below does the marking, so it must not also happen here
                 if emails_to_mark:
-                    print(f"📝 Marking {len(emails_to_mark)} emails as processed (no documents to submit)")
-                    self._mark_emails_in_dynamodb(emails_to_mark, failed_document_ids)
+                    logger.info("📝 Marking %d emails as processed (no documents to submit)", len(emails_to_mark))
                 return True
             
-            print(f"📤 Submitting batch: {len(documents)} documents, {len(documents_to_delete)} deletions")
+            logger.info("📤 Submitting batch: %d documents, %d deletions", len(documents), len(documents_to_delete))
             
             # Delete documents that need updating first (only from Q Business, not DynamoDB)
             if documents_to_delete:
                 try:
-                    print(f"🗑️  Deleting {len(documents_to_delete)} documents for updates...")
+                    logger.info("🗑️  Deleting %d documents for updates...", len(documents_to_delete))
                     self.qbusiness_client.batch_delete_documents(documents_to_delete)
                 except Exception as delete_e:
-                    print(f"⚠️  Error deleting documents for updates: {delete_e}")
+                    logger.warning("⚠️  Error deleting documents for updates: %s", delete_e)
                     # Continue with submission even if deletion fails
             
             # Submit new/updated documents and get detailed results
             if documents:
                 try:
-                    print(f"📄 Submitting {len(documents)} documents...")
+                    logger.info("📄 Submitting %d documents...", len(documents))
                     success, failed_documents = self.qbusiness_client.batch_put_documents(documents)
                     
                     # Extract failed document IDs
                     failed_document_ids = {failed_doc.get('id') for failed_doc in failed_documents if failed_doc.get('id')}
                     
                     successful_count = len(documents) - len(failed_documents)
-                    self.emails_processed_count += successful_count
+                    self._increment_processed_count(successful_count)
                     
                     if success:
-                        print(f"✅ All {len(documents)} documents submitted successfully")
+                        logger.info("✅ All %d documents submitted successfully", len(documents))
                     else:
-                        print(f"⚠️  {successful_count}/{len(documents)} documents submitted successfully, {len(failed_documents)} failed")
+                        logger.warning("⚠️  %d/%d documents submitted successfully, %d failed", successful_count, len(documents), len(failed_documents))
                         
                 except Exception as submit_e:
-                    print(f"❌ Error submitting documents to Q Business: {submit_e}")
+                    logger.error("❌ Error submitting documents to Q Business: %s", submit_e)
                     qbusiness_submission_failed = True
                     # Mark all documents as failed if Q Business submission completely fails
                     failed_document_ids = {doc.get('id') for doc in documents if doc.get('id')}
             
         except Exception as e:
-            print(f"❌ Unexpected error in document batch submission: {e}")
+            logger.error("❌ Unexpected error in document batch submission: %s", e)
             qbusiness_submission_failed = True
             # Mark all documents as failed if there's an unexpected error
             failed_document_ids = {doc.get('id') for doc in documents if doc.get('id')}
@@ -196,10 +226,10 @@ class EmailProcessor:
             # ALWAYS mark emails in DynamoDB, regardless of what happened above
             if emails_to_mark:
                 try:
-                    print(f"📝 Marking {len(emails_to_mark)} emails in DynamoDB based on submission results...")
+                    logger.info("📝 Marking %d emails in DynamoDB based on submission results...", len(emails_to_mark))
                     self._mark_emails_in_dynamodb(emails_to_mark, failed_document_ids, qbusiness_submission_failed)
                 except Exception as mark_e:
-                    print(f"❌ Critical error marking emails in DynamoDB: {mark_e}")
+                    logger.error("❌ Critical error marking emails in DynamoDB: %s", mark_e)
                     # Even if DynamoDB marking fails, try to mark each email individually
                     self._mark_emails_individually(emails_to_mark, failed_document_ids, qbusiness_submission_failed)
         
@@ -208,7 +238,9 @@ class EmailProcessor:
     def _mark_emails_in_dynamodb(self, emails_to_mark: list, failed_document_ids: set, qbusiness_submission_failed: bool = False):
         """Mark emails in DynamoDB based on Q Business submission results"""
         successful_marks = 0
-        failed_marks = 0
+        failed_email_ids = []
+        # (account_email, status) -> count, applied to the account statistics once per batch
+        status_counts = {}
         
         for email_info in emails_to_mark:
             email_id = email_info['email_id']
@@ -217,39 +249,51 @@ class EmailProcessor:
             if qbusiness_submission_failed:
                 # Entire Q Business submission failed, mark as failed
                 final_status = 'failed'
-                failed_marks += 1
-                print(f"  ❌ Marking email {email_id[:20]}... as FAILED (Q Business submission completely failed)")
-            elif email_id in failed_document_ids:
-                # Document failed in Q Business, mark as failed
+                failed_email_ids.append(email_id)
+                logger.debug("Marking email %s... as FAILED (Q Business submission completely failed)", email_id[:20])
+            elif failed_document_ids and email_id in failed_document_ids:
+                # Document failed in Q Business, mark as failed (the set is empty when the whole
+                # batch went through, so the common case skips the lookup)
                 final_status = 'failed'
-                failed_marks += 1
-                print(f"  ❌ Marking email {email_id[:20]}... as FAILED (Q Business submission failed)")
+                failed_email_ids.append(email_id)
+                logger.debug("Marking email %s... as FAILED (Q Business submission failed)", email_id[:20])
             elif email_info['status'] == 'failed':
                 # Document creation failed before Q Business submission
                 final_status = 'failed'
-                failed_marks += 1
-                print(f"  ❌ Marking email {email_id[:20]}... as FAILED (document creation failed)")
+                failed_email_ids.append(email_id)
+                logger.debug("Marking email %s... as FAILED (document creation failed)", email_id[:20])
             else:
                 # Document was successfully submitted to Q Business
                 final_status = 'processed'
                 successful_marks += 1
             
-            # Update account statistics
-            self._update_account_stats(email_info['account_email'], final_status)
+            stats_key = (email_info['account_email'], final_status)
+            status_counts[stats_key] = status_counts.get(stats_key, 0) + 1
             
-            self.dynamodb_client.mark_email_processed(
-                email_info['email_id'],
-                email_info['folder_name'],
-                email_info['datetime_created'],
-                final_status,
-                email_info['account_email']
-            )
+            # Record the final status in place; the batch's records are not used again after marking,
+            # and the individual fallback derives the same status from it
+            email_info['status'] = final_status
+        
+        # Write the whole batch at once instead of one update_item per email
+        if not self.dynamodb_client.mark_emails_processed_bulk(emails_to_mark):
+            logger.warning("⚠️  Some of the %d DynamoDB tracking records could not be written", len(emails_to_mark))
+        
+        # Update account statistics only once the bulk write has returned; if it raises,
+        # the caller falls back to _mark_emails_individually, which counts each email itself
+        for (account_email, status), count in status_counts.items():
+            self._update_account_stats(account_email, status, count)
         
-        print(f"📊 DynamoDB marking completed: {successful_marks} processed, {failed_marks} failed")
+        # One summary line for the failures instead of a print per failed email
+        if failed_email_ids:
+            failed_samples = [email_id[:20] for email_id in failed_email_ids[:FAILED_EMAIL_SAMPLES]]
+            more = len(failed_email_ids) - len(failed_samples)
+            logger.warning("❌ Marking %d emails as FAILED, e.g. %s%s", len(failed_email_ids), failed_samples, f" (+{more} more)" if more else "")
+        
+        logger.info("📊 DynamoDB marking completed: %d processed, %d failed", successful_marks, len(failed_email_ids))
     
     def _mark_emails_individually(self, emails_to_mark: list, failed_document_ids: set, qbusiness_submission_failed: bool = False):
         """Fallback method to mark emails individually if batch marking fails"""
-        print(f"🔄 Attempting to mark {len(emails_to_mark)} emails individually as fallback...")
+        logger.info("🔄 Attempting to mark %d emails individually as fallback...", len(emails_to_mark))
         
         successful_marks = 0
         failed_marks = 0
@@ -278,35 +322,41 @@ class EmailProcessor:
                 )
                 
             except Exception as individual_e:
-                print(f"❌ Failed to mark individual email {email_info.get('email_id', 'unknown')}: {individual_e}")
+                logger.error("❌ Failed to mark individual email %s: %s", email_info.get('email_id', 'unknown'), individual_e)
                 failed_marks += 1
         
-        print(f"📊 Individual DynamoDB marking completed: {successful_marks} processed, {failed_marks} failed")   
+        logger.info("📊 Individual DynamoDB marking completed: %d processed, %d failed", successful_marks, failed_marks)
  
     def process_folder_emails(self, folder, folder_name: str, account_email: str, sync_mode: str = 'delta', sync_job_id: str = None) -> Tuple[bool, Dict[str, int]]:
         """Process emails in a specific folder with streaming document submission"""
         try:
             if self.ews_client.should_skip_folder(folder, folder_name):
-                print(f"Skipping folder: {folder_name}")
+                logger.info("Skipping folder: %s", folder_name)
                 return True, {'processed_count': 0, 'failed_count': 0}
             
-            print(f"Processing folder: {folder_name} (Total: {folder.total_count} emails) - {sync_mode.upper()} mode")
+            logger.info("Processing folder: %s (Total: %s emails) - %s mode", folder_name, folder.total_count, sync_mode.upper())
             
             if folder.total_count == 0:
-                print(f"  No emails in folder {folder_name}")
+                logger.info("No emails in folder %s", folder_name)
                 return True, {'processed_count': 0, 'failed_count': 0}
             
             # Get processed email IDs for this folder (only for delta sync)
             processed_ids = None
             if sync_mode == 'delta':
-                processed_ids = self.dynamodb_client.get_processed_email_ids_for_folder(folder_name, account_email)
-                print(f"  Found {len(processed_ids)} already processed emails in folder {folder_name}")
+                processed_ids = self.dynamodb_client.prime_folder_cache(folder_name, account_email)
+                logger.info("Found %d already processed emails in folder %s", len(processed_ids), folder_name)
             else:
                 processed_ids = set()
-                print(f"  Full sync mode - processing all emails in folder {folder_name}")
+                logger.info("Full sync mode - processing all emails in folder %s", folder_name)
+                # Prime the tracking cache anyway so new records can be batch-written
+                self.dynamodb_client.prime_folder_cache(folder_name, account_email)
             
             # Get all emails in folder
             items = folder.all().only('id')
+            if sync_mode == 'delta':
+                # exchangelib querysets are not cached and delta mode walks the folder twice
+                # (orphan detection, then processing), so list the item IDs from EWS once
+                items = list(items)
             
             # Find and clean up orphaned items for this folder
             orphaned_count = self._find_and_cleanup_folder_orphans(folder_name, account_email, sync_mode, sync_job_id, processed_ids, items)
@@ -317,12 +367,16 @@ class EmailProcessor:
             else:
                 processed_count, failed_count = self._process_emails_sequential(items, folder_name, folder, account_email, sync_mode, sync_job_id, processed_ids)
             
-            print(f"  ✅ Folder {folder_name} completed: {processed_count} processed, {failed_count} failed, {orphaned_count} orphaned cleaned")
+            logger.info("✅ Folder %s completed: %d processed, %d failed, %d orphaned cleaned", folder_name, processed_count, failed_count, orphaned_count)
             return True, {'processed_count': processed_count, 'failed_count': failed_count, 'orphaned_count': orphaned_count}
             
         except Exception as e:
-            print(f"Error processing folder {folder_name}: {e}")
+            logger.error("Error processing folder %s: %s", folder_name, e)
             return False, {'processed_count': 0, 'failed_count': 0}
+        
+        finally:
+            # Only the folders in flight keep their processed ID sets in memory
+            self.dynamodb_client.release_folder_cache(folder_name, account_email)
     
     def _process_emails_sequential(self, items, folder_name: str, folder, account_email: str, sync_mode: str, sync_job_id: str, processed_ids: set) -> Tuple[int, int]:
         """Process emails sequentially (original method)"""
@@ -333,113 +387,132 @@ class EmailProcessor:
         processed_count = 0
         failed_count = 0
         
-        for item in items:
-            # Check processing limit for testing
-            if self.config.testing_email_limit is not None and self.emails_attempted_count >= self.config.testing_email_limit:
-                print(f"Reached processing limit of {self.config.testing_email_limit} emails")
-                break
-            
-            self._increment_attempted_count()
-            
-            # Check if email needs processing (delta mode only)
-            email_id_str = str(item.id)
-            needs_processing = True
-            
-            if sync_mode == 'delta':
-                if email_id_str in processed_ids:
-                    # Email already processed, skip it
-                    needs_processing = False
+        # One reference time for the whole folder's time-period attributes
+        batch_now = datetime.now(timezone.utc)
+        
+        for item_chunk in self._iter_pending_item_chunks(items, sync_mode, processed_ids):
+            # Fetch the chunk from EWS in one request and build its documents, rather than
+            # paying a GetItem round-trip per email
+            chunk_documents = self.document_processor.create_qbusiness_documents_bulk(item_chunk, folder_name, folder, account_email, batch_now)
             
-            if not needs_processing:
-                continue
+            # The chunk's documents were all built by the call above, so read the clock once
+            # for their tracking records instead of once per email
+            current_time = datetime.now(timezone.utc)
             
-            try:
-                # Create Q Business document with ACL for the account owner
-                document = self.document_processor.create_qbusiness_document(item, folder_name, folder, account_email)
-                if document:
-                    documents_batch.append(document)
-                    processed_count += 1
-                else:
+            for item, document in zip(item_chunk, chunk_documents):
+                try:
+                    # Q Business document with ACL for the account owner, or None if creation failed
+                    if document:
+                        documents_batch.append(document)
+                        processed_count += 1
+                    else:
+                        failed_count += 1
+                    
+                    # Store email info for marking as processed later
+                    status = 'processed' if document else 'failed'
+                    emails_to_mark_batch.append({
+                        'email_id': str(item.id),
+                        'folder_name': folder_name,
+                        'datetime_created': current_time,
+                        'status': status,
+                        'account_email': account_email
+                    })
+                    
+                    # Submit batch when it reaches the configured size
+                    if len(documents_batch) >= self.config.document_batch_size:
+                        try:
+                            with self._batch_lock:  # Folders may be processed on several threads
+                                self._submit_document_batch(documents_batch, documents_to_delete_batch, emails_to_mark_batch, sync_job_id)
+                        except Exception as batch_e:
+                            logger.error("❌ Critical error in batch submission: %s", batch_e)
+                            # Even if batch submission fails completely, try to mark emails as failed
+                            with self._batch_lock:
+                                self._mark_emails_individually(emails_to_mark_batch, set(), True)
+                        finally:
+                            # Always clear batches after submission attempt
+                            documents_batch = []
+                            documents_to_delete_batch = []
+                            emails_to_mark_batch = []
+                    
+                except Exception as e:
+                    logger.error("Error processing email %s: %s", item.id, e)
                     failed_count += 1
-                
-                # Store email info for marking as processed later
-                status = 'processed' if document else 'failed'
-                current_time = datetime.now(timezone.utc)
-                emails_to_mark_batch.append({
-                    'email_id': str(item.id),
-                    'folder_name': folder_name,
-                    'datetime_created': current_time,
-                    'status': status,
-                    'account_email': account_email
-                })
-                
-                # Submit batch when it reaches the configured size
-                if len(documents_batch) >= self.config.document_batch_size:
-                    try:
-                        self._submit_document_batch(documents_batch, documents_to_delete_batch, emails_to_mark_batch, sync_job_id)
-                    except Exception as batch_e:
-                        print(f"❌ Critical error in batch submission: {batch_e}")
-                        # Even if batch submission fails completely, try to mark emails as failed
-                        self._mark_emails_individually(emails_to_mark_batch, set(), True)
-                    finally:
-                        # Always clear batches after submission attempt
-                        documents_batch = []
-                        documents_to_delete_batch = []
-                        emails_to_mark_batch = []
-                
-            except Exception as e:
-                print(f"Error processing email {item.id}: {e}")
-                failed_count += 1
-                current_time = datetime.now(timezone.utc)
-                emails_to_mark_batch.append({
-                    'email_id': str(item.id),
-                    'folder_name': folder_name,
-                    'datetime_created': current_time,
-                    'status': 'failed',
-                    'account_email': account_email
-                })
+                    emails_to_mark_batch.append({
+                        'email_id': str(item.id),
+                        'folder_name': folder_name,
+                        'datetime_created': current_time,
+                        'status': 'failed',
+                        'account_email': account_email
+                    })
         
         # Submit any remaining documents in the final batch
         if documents_batch or documents_to_delete_batch or emails_to_mark_batch:
             try:
-                self._submit_document_batch(documents_batch, documents_to_delete_batch, emails_to_mark_batch, sync_job_id)
+                with self._batch_lock:
+                    self._submit_document_batch(documents_batch, documents_to_delete_batch, emails_to_mark_batch, sync_job_id)
             except Exception as final_batch_e:
-                print(f"❌ Critical error in final batch submission: {final_batch_e}")
+                logger.error("❌ Critical error in final batch submission: %s", final_batch_e)
                 # Even if final batch submission fails completely, try to mark emails as failed
-                self._mark_emails_individually(emails_to_mark_batch, set(), True)
+                with self._batch_lock:
+                    self._mark_emails_individually(emails_to_mark_batch, set(), True)
         
         return processed_count, failed_count
     
-    def _process_emails_threaded(self, items, folder_name: str, folder, account_email: str, sync_mode: str, sync_job_id: str, processed_ids: set) -> Tuple[int, int]:
-        """Process emails in parallel using ThreadPoolExecutor"""
-        print(f"  🧵 Using threaded processing with {self.config.max_worker_threads} workers, batch size {self.config.thread_batch_size}")
-        
-        # Convert items to list and filter for processing
-        items_to_process = []
+    def _iter_pending_item_chunks(self, items, sync_mode: str, processed_ids: set):
+        """Yield the items that still need processing in chunks of the document batch size"""
+        chunk = []
         for item in items:
-            # Check processing limit for testing
-            if self.config.testing_email_limit is not None and self.emails_attempted_count >= self.config.testing_email_limit:
-                print(f"Reached processing limit of {self.config.testing_email_limit} emails")
+            # Check processing limit for testing; folders run concurrently, so check and count together
+            if not self._try_count_attempt():
+                logger.info("Reached processing limit of %d emails", self.config.testing_email_limit)
                 break
             
-            self._increment_attempted_count()
-            
             # Check if email needs processing (delta mode only)
-            email_id_str = str(item.id)
-            needs_processing = True
+            if sync_mode == 'delta' and str(item.id) in processed_ids:
+                # Email already processed, skip it
+                continue
             
+            chunk.append(item)
+            if len(chunk) >= self.config.document_batch_size:
+                yield chunk
+                chunk = []
+        
+        if chunk:
+            yield chunk
+    
+    def _process_emails_threaded(self, items, folder_name: str, folder, account_email: str, sync_mode: str, sync_job_id: str, processed_ids: set) -> Tuple[int, int]:
+        """Process emails in parallel using ThreadPoolExecutor"""
+        logger.info("🧵 Using threaded processing with %d workers, batch size %d", self.config.max_worker_threads, self.config.thread_batch_size)
+        
+        # Convert items to list and filter for processing
+        if self.config.testing_email_limit is None:
+            # Without a limit to stop at, filtering is a plain set lookup per item and
+            # the attempted count is bumped once for the whole folder
+            items = list(items)
+            self._increment_attempted_count(len(items))
             if sync_mode == 'delta':
-                if email_id_str in processed_ids:
+                items_to_process = [item for item in items if str(item.id) not in processed_ids]
+            else:
+                items_to_process = items
+        else:
+            items_to_process = []
+            for item in items:
+                # Check processing limit for testing; folders run concurrently, so check and count together
+                if not self._try_count_attempt():
+                    logger.info("Reached processing limit of %d emails", self.config.testing_email_limit)
+                    break
+                
+                # Check if email needs processing (delta mode only)
+                if sync_mode == 'delta' and str(item.id) in processed_ids:
                     # Email already processed, skip it
-                    needs_processing = False
-            
-            if needs_processing:
+                    continue
+                
                 items_to_process.append(item)
         
         if not items_to_process:
             return 0, 0
         
-        print(f"  📧 Processing {len(items_to_process)} emails in parallel...")
+        logger.info("📧 Processing %d emails in parallel...", len(items_to_process))
         
         # Split items into batches for threading
         batches = []
@@ -447,7 +520,7 @@ class EmailProcessor:
             batch = items_to_process[i:i + self.config.thread_batch_size]
             batches.append(batch)
         
-        print(f"  📦 Created {len(batches)} batches for parallel processing")
+        logger.info("📦 Created %d batches for parallel processing", len(batches))
         
         total_processed = 0
         total_failed = 0
@@ -467,9 +540,9 @@ class EmailProcessor:
                     batch_processed, batch_failed = future.result()
                     total_processed += batch_processed
                     total_failed += batch_failed
-                    print(f"    ✅ Batch completed: {batch_processed} processed, {batch_failed} failed")
+                    logger.info("✅ Batch completed: %d processed, %d failed", batch_processed, batch_failed)
                 except Exception as e:
-                    print(f"    ❌ Batch failed: {e}")
+                    logger.error("❌ Batch failed: %s", e)
                     total_failed += len(batch)
         
         return total_processed, total_failed
@@ -483,10 +556,19 @@ class EmailProcessor:
         processed_count = 0
         failed_count = 0
         
-        for item in email_batch:
+        # One reference time for the whole batch's time-period attributes
+        batch_now = datetime.now(timezone.utc)
+        
+        # Fetch the whole batch from EWS in one request and build its documents
+        batch_documents = self.document_processor.create_qbusiness_documents_bulk(email_batch, folder_name, folder, account_email, batch_now)
+        
+        # The documents were all built by the call above, so they share one creation
+        # timestamp, formatted once here instead of per record when it is written
+        current_time = str(datetime.now(timezone.utc))
+        
+        for item, document in zip(email_batch, batch_documents):
             try:
-                # Create Q Business document with ACL for the account owner
-                document = self.document_processor.create_qbusiness_document(item, folder_name, folder, account_email)
+                # Q Business document with ACL for the account owner, or None if creation failed
                 if document:
                     documents_batch.append(document)
                     processed_count += 1
@@ -496,7 +578,6 @@ class EmailProcessor:
                 
                 # Store email info for marking as processed later
                 status = 'processed' if document else 'failed'
-                current_time = datetime.now(timezone.utc)
                 emails_to_mark_batch.append({
                     'email_id': str(item.id),
                     'folder_name': folder_name,
@@ -506,9 +587,8 @@ class EmailProcessor:
                 })
                 
             except Exception as e:
-                print(f"Error processing email {item.id}: {e}")
+                logger.error("Error processing email %s: %s", item.id, e)
                 failed_count += 1
-                current_time = datetime.now(timezone.utc)
                 emails_to_mark_batch.append({
                     'email_id': str(item.id),
                     'folder_name': folder_name,
@@ -523,7 +603,7 @@ class EmailProcessor:
                 with self._batch_lock:  # Ensure thread-safe batch submission
                     self._submit_document_batch(documents_batch, documents_to_delete_batch, emails_to_mark_batch, sync_job_id)
             except Exception as batch_e:
-                print(f"❌ Critical error in threaded batch submission: {batch_e}")
+                logger.error("❌ Critical error in threaded batch submission: %s", batch_e)
                 # Even if batch submission fails completely, try to mark emails as failed
                 with self._batch_lock:
                     self._mark_emails_individually(emails_to_mark_batch, set(), True)
@@ -533,76 +613,58 @@ class EmailProcessor:
     def process_account_folders(self, account, account_email: str, folder_root, root_name: str, sync_mode: str = 'delta', sync_job_id: str = None) -> Tuple[bool, Dict[str, int]]:
         """Process all folders in an account (main or archive) with streaming submission"""
         try:
-            print(f"Processing {root_name} folders for {account_email} - {sync_mode.upper()} mode...")
+            logger.info("Processing %s folders for %s - %s mode...", root_name, account_email, sync_mode.upper())
             
             total_processed = 0
             total_failed = 0
             total_orphaned = 0
             
-            def process_folder_recursive(folder, parent_path=""):
-                nonlocal total_processed, total_failed, total_orphaned
-                
-
-                
-                folder_path = f"{parent_path}/{folder.name}" if parent_path else folder.name
-                
-                # Strip "Top of Information Store/" prefix from folder display name
-                if folder_path.startswith("Top of Information Store/"):
-                    folder_path = folder_path[len("Top of Information Store/"):]
-                elif folder_path == "Top of Information Store":
-                    folder_path = "Root"  # Use "Root" instead of empty string for clarity
-                
-                # Strip "Root/" prefix from folder display name
-                if folder_path.startswith("Root/"):
-                    folder_path = folder_path[len("Root/"):]
-                elif folder_path == "Root":
-                    folder_path = ""  # Root folder becomes empty path
-                
-                # Skip processing if folder_path is empty (root folder case)
-                if not folder_path:
-                    folder_path = "Root"
-                
-                # Process current folder with streaming submission
-                success, folder_stats = self.process_folder_emails(folder, folder_path, account_email, sync_mode, sync_job_id)
-                if not success:
-                    return False
-                
-                # Accumulate statistics
-                total_processed += folder_stats.get('processed_count', 0)
-                total_failed += folder_stats.get('failed_count', 0)
-                total_orphaned += folder_stats.get('orphaned_count', 0)
-                
-                # Process child folders
-                if hasattr(folder, 'children') and folder.children:
-                    for child_folder in folder.children:
-                        if not process_folder_recursive(child_folder, folder_path):
-                            return False
-                
-                return True
+            # Walk the folder tree first, then process the folders on a small pool; most of the
+            # time goes to waiting on EWS, so sibling folders can overlap their round-trips
+            folders = list(self._iter_folder_paths(folder_root))
+            
+            with ThreadPoolExecutor(max_workers=self.config.max_folder_workers) as executor:
+                # Process each folder with streaming submission
+                futures = [
+                    executor.submit(self.process_folder_emails, folder, folder_path, account_email, sync_mode, sync_job_id)
+                    for folder, folder_path in folders
+                ]
+                
+                for future in futures:
+                    success, folder_stats = future.result()
+                    if not success:
+                        # Stop at the first failed folder, as the sequential walk did
+                        for pending_future in futures:
+                            pending_future.cancel()
+                        return False, {'processed_count': total_processed, 'failed_count': total_failed, 'orphaned_count': total_orphaned}
+                    
+                    # Accumulate statistics
+                    total_processed += folder_stats.get('processed_count', 0)
+                    total_failed += folder_stats.get('failed_count', 0)
+                    total_orphaned += folder_stats.get('orphaned_count', 0)
             
-            success = process_folder_recursive(folder_root)
-            return success, {'processed_count': total_processed, 'failed_count': total_failed, 'orphaned_count': total_orphaned}
+            return True, {'processed_count': total_processed, 'failed_count': total_failed, 'orphaned_count': total_orphaned}
             
         except Exception as e:
-            print(f"Error processing {root_name} folders for {account_email}: {e}")
+            logger.error("Error processing %s folders for %s: %s", root_name, account_email, e)
             return False, {'processed_count': 0, 'failed_count': 0, 'orphaned_count': 0}
     
     def process_single_account(self, smtp_address: str, sync_mode: str = 'delta', sync_job_id: str = None) -> Tuple[bool, Dict[str, int]]:
         """Process a single Exchange account with streaming document submission"""
         try:
-            print(f"\n{'='*60}")
-            print(f"Processing Exchange account: {smtp_address} - {sync_mode.upper()} SYNC")
-            print(f"{'='*60}")
+            logger.info("=" * 60)
+            logger.info("Processing Exchange account: %s - %s SYNC", smtp_address, sync_mode.upper())
+            logger.info("=" * 60)
             
             # For full sync, clear existing processed records for this account
             if sync_mode == 'full':
-                print(f"🔄 Full sync mode - clearing existing processed records for {smtp_address}")
+                logger.info("🔄 Full sync mode - clearing existing processed records for %s", smtp_address)
                 self.dynamodb_client.clear_processed_emails_for_account(smtp_address)
             
             # Create Exchange account connection
             account = self.ews_client.create_exchange_account(smtp_address)
             if not account:
-                print(f"Failed to connect to account: {smtp_address}")
+                logger.error("Failed to connect to account: %s", smtp_address)
                 return False, {'processed_count': 0, 'failed_count': 0}
             
             total_processed = 0
@@ -611,7 +673,7 @@ class EmailProcessor:
             
             # Process main mailbox folders (if enabled)
             if self.config.process_main_mailbox and hasattr(account, 'msg_folder_root'):
-                print(f"📁 Processing main mailbox folders for {smtp_address}")
+                logger.info("📁 Processing main mailbox folders for %s", smtp_address)
                 success, main_stats = self.process_account_folders(account, smtp_address, account.msg_folder_root, "main mailbox", sync_mode, sync_job_id)
                 if not success:
                     return False, {'processed_count': 0, 'failed_count': 0, 'orphaned_count': 0}
@@ -619,7 +681,7 @@ class EmailProcessor:
                 total_failed += main_stats.get('failed_count', 0)
                 total_orphaned += main_stats.get('orphaned_count', 0)
             elif not self.config.process_main_mailbox:
-                print(f"⏭️  Skipping main mailbox folders for {smtp_address} (PROCESS_MAIN_MAILBOX=false)")
+                logger.info("⏭️  Skipping main mailbox folders for %s (PROCESS_MAIN_MAILBOX=false)", smtp_address)
             
             # Process archive folders if available
             if hasattr(account, 'archive_msg_folder_root') and account.archive_msg_folder_root:
@@ -635,11 +697,11 @@ class EmailProcessor:
                 orphaned_folder_count = self._cleanup_orphaned_folders(account, smtp_address, sync_job_id)
                 total_orphaned += orphaned_folder_count
             
-            print(f"✅ Completed processing account: {smtp_address} - {total_processed} processed, {total_failed} failed, {total_orphaned} orphaned cleaned")
+            logger.info("✅ Completed processing account: %s - %d processed, %d failed, %d orphaned cleaned", smtp_address, total_processed, total_failed, total_orphaned)
             return True, {'processed_count': total_processed, 'failed_count': total_failed, 'orphaned_count': total_orphaned}
             
         except Exception as e:
-            print(f"❌ Error processing account {smtp_address}: {e}")
+            logger.error("❌ Error processing account %s: %s", smtp_address, e)
             return False, {'processed_count': 0, 'failed_count': 0, 'orphaned_count': 0} 
    
     def prepare_full_sync(self, sync_job_id: str = None) -> bool:
@@ -648,22 +710,22 @@ class EmailProcessor:
         This ensures we reprocess all emails and clean up any orphaned documents.
         """
         try:
-            print("🧹 Preparing for FULL SYNC - clearing Q Business documents and DynamoDB tracking table...")
+            logger.info("🧹 Preparing for FULL SYNC - clearing Q Business documents and DynamoDB tracking table...")
             
             # Get all processed emails before clearing
             all_processed_set = self.dynamodb_client.get_all_processed_email_ids()
             all_processed = list(all_processed_set)  # Convert set to list for indexing
-            print(f"  📊 Found {len(all_processed)} existing processed emails in DynamoDB")
+            logger.info("📊 Found %d existing processed emails in DynamoDB", len(all_processed))
             
             if all_processed:
-                print("  🗑️  Clearing both Q Business documents and DynamoDB tracking table for fresh start...")
+                logger.info("🗑️  Clearing both Q Business documents and DynamoDB tracking table for fresh start...")
                 
                 # Use provided sync job ID - it should already be started by the main process
                 if not sync_job_id:
-                    print("  ❌ No sync job ID provided for full sync preparation")
+                    logger.error("❌ No sync job ID provided for full sync preparation")
                     return False
                 else:
-                    print(f"  📋 Using existing sync job for cleanup: {sync_job_id}")
+                    logger.info("📋 Using existing sync job for cleanup: %s", sync_job_id)
                     should_stop_sync_job = False
                 
                 try:
@@ -674,7 +736,7 @@ class EmailProcessor:
                     for i in range(0, len(all_processed), batch_size):
                         batch = all_processed[i:i + batch_size]
                         
-                        print(f"  🗑️  Deleting batch {i//batch_size + 1}/{(len(all_processed) + batch_size - 1)//batch_size}...")
+                        logger.debug("🗑️  Deleting batch %d/%d...", i//batch_size + 1, (len(all_processed) + batch_size - 1)//batch_size)
                         
                         # Use helper method to ensure both Q Business and DynamoDB deletions
                         if self._delete_documents_and_records(batch, sync_job_id, "full sync preparation"):
@@ -682,20 +744,20 @@ class EmailProcessor:
                         
 
                     
-                    print(f"  ✅ Cleared {total_deleted}/{len(all_processed)} documents from both Q Business and DynamoDB")
+                    logger.info("✅ Cleared %d/%d documents from both Q Business and DynamoDB", total_deleted, len(all_processed))
                     
                 finally:
                     # Don't stop the sync job - it will be stopped by the main process
                     pass
                     
             else:
-                print("  ✅ DynamoDB table is already empty, no Q Business cleanup needed")
+                logger.info("✅ DynamoDB table is already empty, no Q Business cleanup needed")
             
-            print("🎯 Full sync preparation completed - ready to reprocess all emails")
+            logger.info("🎯 Full sync preparation completed - ready to reprocess all emails")
             return True
             
         except Exception as e:
-            print(f"❌ Error preparing for full sync: {e}")
+            logger.error("❌ Error preparing for full sync: %s", e)
             return False
     
     def process_all_accounts(self, sync_mode: str = 'delta', sync_job_id: str = None) -> Tuple[bool, Dict[str, Any]]:
@@ -703,33 +765,33 @@ class EmailProcessor:
         self.execution_start_time = datetime.now(timezone.utc)
         
         if not self.config.primary_smtp_addresses:
-            print("❌ No email addresses configured")
+            logger.error("❌ No email addresses configured")
             return False, {'processed_count': 0, 'failed_count': 0, 'orphaned_count': 0}
         
-        print(f"🔄 Starting {sync_mode.upper()} SYNC for {len(self.config.primary_smtp_addresses)} account(s)")
-        print(f"📦 Using batch size of {self.config.document_batch_size} documents per submission")
+        logger.info("🔄 Starting %s SYNC for %d account(s)", sync_mode.upper(), len(self.config.primary_smtp_addresses))
+        logger.info("📦 Using batch size of %d documents per submission", self.config.document_batch_size)
         
         # For full sync, prepare by clearing DynamoDB tracking
         if sync_mode == 'full':
             if not self.prepare_full_sync(sync_job_id):
-                print("❌ Failed to prepare for full sync")
+                logger.error("❌ Failed to prepare for full sync")
                 return False, {'processed_count': 0, 'failed_count': 0, 'orphaned_count': 0}
         
         # Use provided sync job ID or prepare to start one when needed
         if sync_job_id:
-            print(f"📋 Using existing Q Business sync job: {sync_job_id}")
+            logger.info("📋 Using existing Q Business sync job: %s", sync_job_id)
             self.qbusiness_client.current_sync_job_id = sync_job_id
             self.qbusiness_client.sync_job_started = True
         else:
-            print("📋 Q Business sync job will be started once at the beginning and reused throughout the process...")
+            logger.info("📋 Q Business sync job will be started once at the beginning and reused throughout the process...")
             
             # Check for existing running sync jobs early to avoid conflicts later
             if self.qbusiness_client.has_running_sync_jobs():
                 if self.config.auto_resolve_sync_conflicts:
-                    print("⚠️  Detected existing running sync jobs. Auto-resolve is enabled - will stop existing jobs when sync job is needed.")
+                    logger.warning("⚠️  Detected existing running sync jobs. Auto-resolve is enabled - will stop existing jobs when sync job is needed.")
                 else:
-                    print("⚠️  Detected existing running sync jobs. Auto-resolve is disabled.")
-                    print("❌ Cannot start new sync job while another is running. Set AUTO_RESOLVE_SYNC_CONFLICTS=true to automatically stop existing jobs.")
+                    logger.warning("⚠️  Detected existing running sync jobs. Auto-resolve is disabled.")
+                    logger.error("❌ Cannot start new sync job while another is running. Set AUTO_RESOLVE_SYNC_CONFLICTS=true to automatically stop existing jobs.")
                     return False, {'processed_count': 0, 'failed_count': 0, 'orphaned_count': 0}
         
         try:
@@ -746,13 +808,13 @@ class EmailProcessor:
                     total_failed += account_stats.get('failed_count', 0)
                     total_orphaned += account_stats.get('orphaned_count', 0)
             
-            print(f"\n📊 Processing Summary ({sync_mode.upper()} SYNC):")
-            print(f"  Accounts processed: {success_count}/{len(self.config.primary_smtp_addresses)}")
-            print(f"  Emails attempted: {self.emails_attempted_count}")
-            print(f"  Documents processed: {total_processed}")
-            print(f"  Documents failed: {total_failed}")
-            print(f"  Orphaned items cleaned: {total_orphaned}")
-            print(f"  Total emails processed: {self.emails_processed_count}")
+            logger.info("📊 Processing Summary (%s SYNC):", sync_mode.upper())
+            logger.info("Accounts processed: %d/%d", success_count, len(self.config.primary_smtp_addresses))
+            logger.info("Emails attempted: %d", self.emails_attempted_count)
+            logger.info("Documents processed: %d", total_processed)
+            logger.info("Documents failed: %d", total_failed)
+            logger.info("Orphaned items cleaned: %d", total_orphaned)
+            logger.info("Total emails processed: %d", self.emails_processed_count)
             
             return success_count > 0, {
                 'processed_count': total_processed, 
@@ -761,7 +823,7 @@ class EmailProcessor:
             }
         
         except Exception as e:
-            print(f"❌ Error processing accounts: {e}")
+            logger.error("❌ Error processing accounts: %s", e)
             return False, {'processed_count': 0, 'failed_count': 0, 'orphaned_count': 0}
 
     def _find_and_cleanup_folder_orphans(self, folder_name: str, account_email: str, sync_mode: str, sync_job_id: str = None, processed_ids: set = None, items = None) -> int:
@@ -773,8 +835,8 @@ class EmailProcessor:
             
             # Validate required inputs
             if processed_ids is None or items is None:
-                print(f"  ⚠️  Missing required data for orphaned detection in folder {folder_name}")
-                print(f"  ⏭️  Skipping orphaned cleanup for folder {folder_name} for safety")
+                logger.warning("⚠️  Missing required data for orphaned detection in folder %s", folder_name)
+                logger.warning("⏭️  Skipping orphaned cleanup for folder %s for safety", folder_name)
                 return 0
             
             # Get current email IDs from the provided items - with error handling
@@ -783,15 +845,15 @@ class EmailProcessor:
                 for item in items:
                     current_ids.add(str(item.id))
             except Exception as e:
-                print(f"  ⚠️  Error processing Exchange items for folder {folder_name}: {e}")
-                print(f"  ⏭️  Skipping orphaned cleanup for folder {folder_name} due to Exchange error")
+                logger.warning("⚠️  Error processing Exchange items for folder %s: %s", folder_name, e)
+                logger.warning("⏭️  Skipping orphaned cleanup for folder %s due to Exchange error", folder_name)
                 return 0
             
             # Find orphaned items (in DynamoDB but not in current folder)
             orphaned_ids = processed_ids - current_ids
             
             if orphaned_ids:
-                print(f"  🗑️  Found {len(orphaned_ids)} orphaned items in folder {folder_name}")
+                logger.info("🗑️  Found %d orphaned items in folder %s", len(orphaned_ids), folder_name)
                 
                 # Delete orphaned items in batches
                 batch_size = 10
@@ -800,26 +862,26 @@ class EmailProcessor:
                 
                 for i in range(0, len(orphaned_list), batch_size):
                     batch = orphaned_list[i:i + batch_size]
-                    print(f"    Deleting orphaned batch {i//batch_size + 1}/{(len(orphaned_list) + batch_size - 1)//batch_size} from {folder_name}...")
+                    logger.debug("Deleting orphaned batch %d/%d from %s...", i//batch_size + 1, (len(orphaned_list) + batch_size - 1)//batch_size, folder_name)
                     
                     if self._delete_documents_and_records(batch, sync_job_id, f"orphaned cleanup in {folder_name}", account_email, folder_name):
                         total_deleted += len(batch)
                 
-                print(f"  ✅ Cleaned up {total_deleted}/{len(orphaned_ids)} orphaned items from folder {folder_name}")
+                logger.info("✅ Cleaned up %d/%d orphaned items from folder %s", total_deleted, len(orphaned_ids), folder_name)
                 return total_deleted
             else:
-                print(f"  ✅ No orphaned items found in folder {folder_name}")
+                logger.info("✅ No orphaned items found in folder %s", folder_name)
                 return 0
                 
         except Exception as e:
-            print(f"❌ Unexpected error during orphaned cleanup in folder {folder_name}: {e}")
-            print(f"  ⏭️  Skipping orphaned cleanup for folder {folder_name} for safety")
+            logger.error("❌ Unexpected error during orphaned cleanup in folder %s: %s", folder_name, e)
+            logger.warning("⏭️  Skipping orphaned cleanup for folder %s for safety", folder_name)
             return 0
     
     def _cleanup_orphaned_folders(self, account, account_email: str, sync_job_id: str = None) -> int:
         """Clean up orphaned folders that exist in DynamoDB but not in Exchange"""
         try:
-            print(f"\n🗂️  Checking for orphaned folders in account {account_email}...")
+            logger.info("🗂️  Checking for orphaned folders in account %s...", account_email)
             
             # Get all current folder names from Exchange
             current_folders = set()
@@ -828,19 +890,19 @@ class EmailProcessor:
             try:
                 # Collect folders from main mailbox if enabled
                 if self.config.process_main_mailbox and hasattr(account, 'msg_folder_root'):
-                    print("  📁 Collecting current folder names from main mailbox...")
+                    logger.info("📁 Collecting current folder names from main mailbox...")
                     self._collect_folder_names(account.msg_folder_root, current_folders)
                 
                 # Collect folders from archive if available
                 if hasattr(account, 'archive_msg_folder_root') and account.archive_msg_folder_root:
-                    print("  📁 Collecting current folder names from archive...")
+                    logger.info("📁 Collecting current folder names from archive...")
                     self._collect_folder_names(account.archive_msg_folder_root, current_folders)
                     
-                print(f"  📊 Found {len(current_folders)} current folders in Exchange")
+                logger.info("📊 Found %d current folders in Exchange", len(current_folders))
                 
             except Exception as e:
-                print(f"  ⚠️  Error collecting current folder names from Exchange: {e}")
-                print(f"  ⏭️  Skipping orphaned folder cleanup for safety")
+                logger.warning("⚠️  Error collecting current folder names from Exchange: %s", e)
+                logger.warning("⏭️  Skipping orphaned folder cleanup for safety")
                 exchange_error = True
             
             if exchange_error:
@@ -851,21 +913,20 @@ class EmailProcessor:
             dynamodb_error = False
             
             try:
-                print("  🗄️  Collecting processed folder names from DynamoDB...")
-                processed_emails = self.dynamodb_client.get_processed_emails_by_account(account_email)
-                
-                for email_record in processed_emails:
+                logger.info("🗄️  Collecting processed folder names from DynamoDB...")
+                # Stream the account's records; only the set of folder names is kept
+                for email_record in self.dynamodb_client.iter_processed_emails_by_account(account_email, 'folder_email_key'):
                     folder_email_key = email_record.get('folder_email_key', '')
                     if folder_email_key:
                         folder_name = self.dynamodb_client._extract_folder_from_folder_email_key(folder_email_key)
                         if folder_name:
                             processed_folders.add(folder_name)
                 
-                print(f"  📊 Found {len(processed_folders)} processed folders in DynamoDB")
+                logger.info("📊 Found %d processed folders in DynamoDB", len(processed_folders))
                 
             except Exception as e:
-                print(f"  ⚠️  Error collecting processed folder names from DynamoDB: {e}")
-                print(f"  ⏭️  Skipping orphaned folder cleanup for safety")
+                logger.warning("⚠️  Error collecting processed folder names from DynamoDB: %s", e)
+                logger.warning("⏭️  Skipping orphaned folder cleanup for safety")
                 dynamodb_error = True
             
             if dynamodb_error:
@@ -875,23 +936,23 @@ class EmailProcessor:
             orphaned_folders = processed_folders - current_folders
             
             if not orphaned_folders:
-                print("  ✅ No orphaned folders found")
+                logger.info("✅ No orphaned folders found")
                 return 0
             
-            print(f"  🗑️  Found {len(orphaned_folders)} orphaned folders: {', '.join(sorted(orphaned_folders))}")
+            logger.info("🗑️  Found %d orphaned folders: %s", len(orphaned_folders), ', '.join(sorted(orphaned_folders)))
             
             # Clean up orphaned folders one by one
             total_orphaned_items = 0
             
             for folder_name in sorted(orphaned_folders):
-                print(f"    🗂️  Cleaning up orphaned folder: {folder_name}")
+                logger.info("🗂️  Cleaning up orphaned folder: %s", folder_name)
                 
                 try:
                     # Get all processed email IDs for this orphaned folder
                     orphaned_folder_emails = self.dynamodb_client.get_processed_email_ids_for_folder(folder_name, account_email)
                     
                     if orphaned_folder_emails:
-                        print(f"      📧 Found {len(orphaned_folder_emails)} orphaned emails in folder {folder_name}")
+                        logger.info("📧 Found %d orphaned emails in folder %s", len(orphaned_folder_emails), folder_name)
                         
                         # Delete orphaned emails in batches
                         batch_size = 10
@@ -899,60 +960,59 @@ class EmailProcessor:
                         
                         for i in range(0, len(orphaned_list), batch_size):
                             batch = orphaned_list[i:i + batch_size]
-                            print(f"      🗑️  Deleting batch {i//batch_size + 1}/{(len(orphaned_list) + batch_size - 1)//batch_size} from orphaned folder {folder_name}...")
+                            logger.debug("🗑️  Deleting batch %d/%d from orphaned folder %s...", i//batch_size + 1, (len(orphaned_list) + batch_size - 1)//batch_size, folder_name)
                             
                             if self._delete_documents_and_records(batch, sync_job_id, f"orphaned folder cleanup: {folder_name}", account_email, folder_name):
                                 total_orphaned_items += len(batch)
                         
-                        print(f"      ✅ Cleaned up {len(orphaned_folder_emails)} orphaned emails from folder {folder_name}")
+                        logger.info("✅ Cleaned up %d orphaned emails from folder %s", len(orphaned_folder_emails), folder_name)
                     else:
-                        print(f"      ℹ️  No orphaned emails found in folder {folder_name}")
+                        logger.info("ℹ️  No orphaned emails found in folder %s", folder_name)
                         
                 except Exception as e:
-                    print(f"      ❌ Error cleaning up orphaned folder {folder_name}: {e}")
+                    logger.error("❌ Error cleaning up orphaned folder %s: %s", folder_name, e)
                     continue
             
-            print(f"  ✅ Orphaned folder cleanup completed: {total_orphaned_items} total items cleaned from {len(orphaned_folders)} folders")
+            logger.info("✅ Orphaned folder cleanup completed: %d total items cleaned from %d folders", total_orphaned_items, len(orphaned_folders))
             return total_orphaned_items
             
         except Exception as e:
-            print(f"❌ Unexpected error during orphaned folder cleanup for account {account_email}: {e}")
-            print(f"  ⏭️  Skipping orphaned folder cleanup for safety")
+            logger.error("❌ Unexpected error during orphaned folder cleanup for account %s: %s", account_email, e)
+            logger.warning("⏭️  Skipping orphaned folder cleanup for safety")
             return 0
     
+    def _iter_folder_paths(self, folder_root):
+        """Walk the folder tree depth-first, yielding (folder, display path) pairs"""
+        stack = [(folder_root, "")]
+        while stack:
+            folder, parent_path = stack.pop()
+            folder_path = f"{parent_path}/{folder.name}" if parent_path else folder.name
+            
+            # Strip the "Top of Information Store" and "Root" prefixes from folder display name
+            for prefix, name, replacement in FOLDER_PATH_PREFIXES:
+                if folder_path.startswith(prefix):
+                    folder_path = folder_path[len(prefix):]
+                elif folder_path == name:
+                    folder_path = replacement
+            
+            # Root folder becomes "Root" rather than an empty path
+            if not folder_path:
+                folder_path = "Root"
+            
+            yield folder, folder_path
+            
+            # Push children in reverse so they are visited in their original order
+            if hasattr(folder, 'children') and folder.children:
+                stack.extend((child_folder, folder_path) for child_folder in reversed(list(folder.children)))
+    
     def _collect_folder_names(self, folder_root, folder_names: set, parent_path: str = "") -> None:
-        """Recursively collect folder names from Exchange folder structure"""
+        """Collect folder names from Exchange folder structure"""
         try:
-            def collect_recursive(folder, parent_path=""):
-                folder_path = f"{parent_path}/{folder.name}" if parent_path else folder.name
-                
-                # Strip "Top of Information Store/" prefix from folder display name
-                if folder_path.startswith("Top of Information Store/"):
-                    folder_path = folder_path[len("Top of Information Store/"):]
-                elif folder_path == "Top of Information Store":
-                    folder_path = "Root"
-                
-                # Strip "Root/" prefix from folder display name
-                if folder_path.startswith("Root/"):
-                    folder_path = folder_path[len("Root/"):]
-                elif folder_path == "Root":
-                    folder_path = ""
-                
-                # Skip processing if folder_path is empty (root folder case)
-                if not folder_path:
-                    folder_path = "Root"
-                
+            for folder, folder_path in self._iter_folder_paths(folder_root):
                 # Skip system folders that we don't process
                 if not self.ews_client.should_skip_folder(folder, folder_path):
                     folder_names.add(folder_path)
-                
-                # Process child folders
-                if hasattr(folder, 'children') and folder.children:
-                    for child_folder in folder.children:
-                        collect_recursive(child_folder, folder_path)
-            
-            collect_recursive(folder_root)
             
         except Exception as e:
-            print(f"    ⚠️  Error collecting folder names: {e}")
+            logger.warning("⚠️  Error collecting folder names: %s", e)
             raise
\ No newline at end of file
@@ -26,6 +26,9 @@ except AttributeError:
 exchangelib_fields_logger = logging.getLogger('exchangelib.fields')
 exchangelib_fields_logger.setLevel(logging.WARNING)  # Only show WARNING and above, suppress INFO
 
+# Upper bound on pooled EWS connections per account, to stay under Exchange's per-user concurrency throttling
+MAX_EWS_CONNECTIONS = 10
+
 class EWSClient:
     """
     Exchange Web Services client for connecting to Exchange Online
@@ -54,10 +57,14 @@ class EWSClient:
                 identity=Identity(primary_smtp_address=smtp_address)
             )
 
+            # exchangelib keeps a single pooled session per account unless told otherwise, which
+            # would serialize the folder and batch worker threads on one connection
             config = Configuration(
                 server=self.config.exchange_server,
                 credentials=credentials,
-                auth_type=OAUTH2
+                auth_type=OAUTH2,
+                max_connections=min(self.config.max_folder_workers * max(self.config.max_worker_threads, 1),
+                                    MAX_EWS_CONNECTIONS)
             )
 
             # Use IMPERSONATION access type for read-only operations
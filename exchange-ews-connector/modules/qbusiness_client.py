@@ -3,22 +3,30 @@ Q Business Client Module
 Handles AWS Q Business operations for document indexing and sync job management
 """
 
-import boto3
 import time
 import logging
 import threading
 from typing import Dict, Any, Optional, List
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
+from .config import get_boto3_session
 from .security_utils import handle_error_securely
 
 logger = logging.getLogger(__name__)
 
+# Keep the HTTPS connections to Q Business alive between batch submissions and deletions
+QBUSINESS_BOTO_CONFIG = BotoConfig(
+    max_pool_connections=20,
+    tcp_keepalive=True,
+    retries={'max_attempts': 5, 'mode': 'adaptive'}
+)
+
 class QBusinessClient:
     """AWS Q Business client for managing sync jobs and document indexing"""
     
     def __init__(self, config):
         self.config = config
-        self.client = boto3.client('qbusiness')
+        self.client = get_boto3_session().client('qbusiness', config=QBUSINESS_BOTO_CONFIG)
         self.current_sync_job_id = None
         self.sync_job_started = False
         
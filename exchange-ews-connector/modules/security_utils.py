@@ -51,13 +51,17 @@ def validate_email_content(content: str, max_size_mb: int = 10) -> bool:
     if not content:
         return True
     
-    # Check size limit
-    content_size_mb = len(content.encode('utf-8')) / (1024 * 1024)
-    if content_size_mb > max_size_mb:
-        raise ValueError(f"Content size {content_size_mb:.2f}MB exceeds limit of {max_size_mb}MB")
+    # Check size limit. UTF-8 uses 1-4 bytes per character, so the body only
+    # needs encoding when the character count alone cannot decide.
+    max_size_bytes = max_size_mb * 1024 * 1024
+    char_count = len(content)
+    if char_count * 4 > max_size_bytes:
+        content_size = char_count if char_count > max_size_bytes else len(content.encode('utf-8'))
+        if content_size > max_size_bytes:
+            raise ValueError(f"Content size {content_size / (1024 * 1024):.2f}MB exceeds limit of {max_size_mb}MB")
     
     # Basic content validation
-    if len(content.strip()) == 0:
+    if content.isspace():
         return False
     
     return True
@@ -3,13 +3,13 @@ Sync Job Coordinator Module
 Manages distributed Q Business sync jobs across multiple containers using DynamoDB
 """
 
-import boto3
 import time
 import uuid
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any, List
 from botocore.exceptions import ClientError
+from .dynamodb_client import get_dynamodb_resource
 from .security_utils import sanitize_for_logging, handle_error_securely
 
 logger = logging.getLogger(__name__)
@@ -24,7 +24,8 @@ class SyncJobCoordinator:
     def __init__(self, config, qbusiness_client):
         self.config = config
         self.qbusiness_client = qbusiness_client
-        self.dynamodb = boto3.resource('dynamodb')
+        # Reuse the keep-alive, pooled resource the tracking table client uses
+        self.dynamodb = get_dynamodb_resource()
         
         # Use a separate table for sync job coordination
         self.sync_table_name = f"{config.table_name}-sync-jobs"
@@ -132,7 +133,8 @@ class SyncJobCoordinator:
         try:
             self._ensure_sync_table_exists()
             
-            current_time = datetime.now(timezone.utc).isoformat()
+            now = datetime.now(timezone.utc)
+            current_time = now.isoformat()
             
             # Register container as active in this sync job
             self.sync_table.put_item(
@@ -145,7 +147,7 @@ class SyncJobCoordinator:
                     'status': 'ACTIVE',
                     'registered_at': current_time,
                     'last_heartbeat': current_time,
-                    'ttl': int((datetime.now(timezone.utc) + timedelta(hours=24)).timestamp())
+                    'ttl': int((now + timedelta(hours=24)).timestamp())
                 }
             )
             
@@ -170,7 +172,8 @@ class SyncJobCoordinator:
         try:
             self._ensure_sync_table_exists()
             
-            current_time = datetime.now(timezone.utc).isoformat()
+            now = datetime.now(timezone.utc)
+            current_time = now.isoformat()
             
             self.sync_table.update_item(
                 Key={
@@ -183,7 +186,7 @@ class SyncJobCoordinator:
                 },
                 ExpressionAttributeValues={
                     ':heartbeat': current_time,
-                    ':ttl': int((datetime.now(timezone.utc) + timedelta(hours=24)).timestamp())
+                    ':ttl': int((now + timedelta(hours=24)).timestamp())
                 }
             )
             
@@ -297,7 +300,8 @@ class SyncJobCoordinator:
         try:
             self._ensure_sync_table_exists()
             
-            current_time = datetime.now(timezone.utc).isoformat()
+            now = datetime.now(timezone.utc)
+            current_time = now.isoformat()
             
             # Try to register as the sync job owner
             self.sync_table.put_item(
@@ -309,7 +313,7 @@ class SyncJobCoordinator:
                     'status': 'ACTIVE',
                     'created_at': current_time,
                     'last_heartbeat': current_time,
-                    'ttl': int((datetime.now(timezone.utc) + timedelta(hours=24)).timestamp())
+                    'ttl': int((now + timedelta(hours=24)).timestamp())
                 },
                 ConditionExpression='attribute_not_exists(job_id)'  # Only create if doesn't exist
             )
@@ -575,20 +579,27 @@ class SyncJobCoordinator:
             current_time = datetime.now(timezone.utc)
             stale_threshold = current_time - timedelta(minutes=10)
             
-            # Scan for stale registrations
-            response = self.sync_table.scan()
+            # Scan for stale registrations, reading only the keys and heartbeat
+            scan_kwargs = {
+                'ProjectionExpression': 'job_type, job_id, last_heartbeat'
+            }
             
             stale_items = []
-            for item in response['Items']:
-                last_heartbeat_str = item.get('last_heartbeat', '')
-                if last_heartbeat_str:
-                    try:
-                        last_heartbeat = datetime.fromisoformat(last_heartbeat_str.replace('Z', '+00:00'))
-                        if last_heartbeat < stale_threshold:
+            while True:
+                response = self.sync_table.scan(**scan_kwargs)
+                for item in response['Items']:
+                    last_heartbeat_str = item.get('last_heartbeat', '')
+                    if last_heartbeat_str:
+                        try:
+                            last_heartbeat = datetime.fromisoformat(last_heartbeat_str.replace('Z', '+00:00'))
+                            if last_heartbeat < stale_threshold:
+                                stale_items.append(item)
+                        except ValueError:
+                            # Invalid timestamp, consider stale
                             stale_items.append(item)
-                    except ValueError:
-                        # Invalid timestamp, consider stale
-                        stale_items.append(item)
+                if 'LastEvaluatedKey' not in response:
+                    break
+                scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
             
             # Remove stale items
             for item in stale_items:
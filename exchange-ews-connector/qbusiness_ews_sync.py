@@ -503,6 +503,7 @@ if __name__ == "__main__":
         print("  ENABLE_THREADING            - Enable parallel processing: 'true' or 'false' (default: true)")
         print("  MAX_WORKER_THREADS          - Maximum number of worker threads (default: 4)")
         print("  THREAD_BATCH_SIZE           - Number of emails per thread batch (default: 50)")
+        print("  MAX_FOLDER_WORKERS          - Number of folders processed at once per account (default: 4)")
         print()
         print("Sync Modes:")
         print("  delta                       - Only process new/changed emails (default)")
@@ -0,0 +1,100 @@
+"""
+Email Processor Tests
+Checks batch marking in DynamoDB and the shared processing counters
+"""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from modules.email_processor import EmailProcessor
+
+
+def _emails_to_mark(account_email, statuses):
+    """Build the tracking records a processed batch hands to _submit_document_batch"""
+    return [
+        {
+            'email_id': f'email-{i}',
+            'folder_name': 'Inbox',
+            'datetime_created': '2024-01-01 00:00:00+00:00',
+            'status': status,
+            'account_email': account_email
+        }
+        for i, status in enumerate(statuses)
+    ]
+
+
+class MarkEmailsInDynamoDBTest(unittest.TestCase):
+    """Account statistics for a marked batch"""
+
+    def setUp(self):
+        # Keep the constructor from building real EWS, Q Business and DynamoDB clients
+        with patch('modules.email_processor.EWSClient'), \
+                patch('modules.email_processor.DocumentProcessor'), \
+                patch('modules.email_processor.DynamoDBClient'), \
+                patch('modules.email_processor.QBusinessClient'):
+            self.processor = EmailProcessor(SimpleNamespace())
+        self.dynamodb_client = self.processor.dynamodb_client
+        self.qbusiness_client = self.processor.qbusiness_client
+
+    def test_stats_counted_once_when_bulk_write_succeeds(self):
+        self.dynamodb_client.mark_emails_processed_bulk.return_value = True
+        emails_to_mark = _emails_to_mark('user@example.com', ['processed', 'processed', 'failed'])
+
+        self.processor._submit_document_batch([], [], emails_to_mark)
+
+        self.assertEqual(self.processor.get_account_processing_stats(),
+                         {'user@example.com': {'processed': 2, 'failed': 1, 'total': 3}})
+        self.dynamodb_client.mark_email_processed.assert_not_called()
+
+    def test_stats_counted_once_when_bulk_write_raises(self):
+        # Anything other than ClientError escapes the bulk write and triggers the individual fallback
+        self.dynamodb_client.mark_emails_processed_bulk.side_effect = ValueError("account_email is required")
+        emails_to_mark = _emails_to_mark('user@example.com', ['processed', 'processed', 'failed'])
+
+        self.processor._submit_document_batch([], [], emails_to_mark)
+
+        self.assertEqual(self.processor.get_account_processing_stats(),
+                         {'user@example.com': {'processed': 2, 'failed': 1, 'total': 3}})
+        self.assertEqual(self.dynamodb_client.mark_email_processed.call_count, 3)
+
+    def test_fallback_keeps_qbusiness_document_failures(self):
+        self.qbusiness_client.batch_put_documents.return_value = (False, [{'id': 'email-0'}])
+        self.dynamodb_client.mark_emails_processed_bulk.side_effect = ConnectionError("endpoint unreachable")
+        emails_to_mark = _emails_to_mark('user@example.com', ['processed', 'processed'])
+        documents = [{'id': 'email-0'}, {'id': 'email-1'}]
+
+        self.processor._submit_document_batch(documents, [], emails_to_mark)
+
+        self.assertEqual(self.processor.get_account_processing_stats(),
+                         {'user@example.com': {'processed': 1, 'failed': 1, 'total': 2}})
+        marked_statuses = {call.args[0]: call.args[3] for call in self.dynamodb_client.mark_email_processed.call_args_list}
+        self.assertEqual(marked_statuses, {'email-0': 'failed', 'email-1': 'processed'})
+
+
+
+class TestingEmailLimitTest(unittest.TestCase):
+    """TESTING_EMAIL_LIMIT shared by concurrently processed folders"""
+
+    def setUp(self):
+        with patch('modules.email_processor.EWSClient'), \
+                patch('modules.email_processor.DocumentProcessor'), \
+                patch('modules.email_processor.DynamoDBClient'), \
+                patch('modules.email_processor.QBusinessClient'):
+            self.processor = EmailProcessor(SimpleNamespace(testing_email_limit=25, document_batch_size=10))
+
+    def test_limit_not_overshot_by_concurrent_folders(self):
+        folders = [[SimpleNamespace(id=f'folder-{f}-email-{i}') for i in range(50)] for f in range(8)]
+
+        def pending_count(items):
+            return sum(len(chunk) for chunk in self.processor._iter_pending_item_chunks(items, 'full', set()))
+
+        with ThreadPoolExecutor(max_workers=len(folders)) as executor:
+            pending_total = sum(executor.map(pending_count, folders))
+
+        self.assertEqual(self.processor.emails_attempted_count, 25)
+        self.assertEqual(pending_total, 25)
+
+if __name__ == '__main__':
+    unittest.main()